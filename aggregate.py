@@ -0,0 +1,101 @@
+"""훈련기관 × 개강월 × 훈련유형 집계 큐브
+
+데이터를 불러올 때 한 번만 행 단위 groupby를 돌려 작은 집계표(큐브)를 만들고,
+상위 N개 기관, 월별/일별 추이, 요약 지표는 모두 이 큐브에서 계산합니다.
+화면을 다시 그릴 때마다 전체 행을 다시 집계하지 않아도 됩니다.
+"""
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+DIMENSIONS = ["훈련기관", "개강월", "훈련유형"]
+MEASURES = ["회차", "신청인원", "교육비합계"]
+
+
+class AggregateCube:
+    """집계표와 큐브로는 다시 구할 수 없는 값(고유 훈련과정 수)을 함께 보관합니다."""
+
+    def __init__(self, table: pd.DataFrame, course_count: int, daily_table: Optional[pd.DataFrame] = None):
+        self.table = table
+        self.course_count = course_count
+        # 개강일 × 훈련유형 합계 (일 단위 추이 그래프용)
+        self.daily_table = daily_table
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, course_type: str = "") -> "AggregateCube":
+        """훈련 데이터프레임으로 큐브를 만듭니다.
+
+        훈련유형 열이 없으면 조회한 훈련유형(course_type)을 모든 행에 씁니다.
+        """
+        # 개강일이 없는(NaT) 행도 요약 지표와 기관별 합계에 넣도록 dropna=False로 묶습니다.
+        # 월 단위 절삭은 NumPy에서 하고, 문자열 변환은 작은 집계표에서만 합니다.
+        months = pd.Series(df["개강일"].to_numpy().astype("datetime64[M]"), index=df.index, name="개강월")
+        if "훈련유형" in df.columns:
+            types = df["훈련유형"]
+        else:
+            types = pd.Series(course_type, index=df.index, name="훈련유형")
+        table = (
+            df.groupby([df["훈련기관"], months, types], observed=True, dropna=False)
+            .agg(
+                회차=("신청인원", "size"),
+                신청인원=("신청인원", "sum"),
+                교육비합계=("교육비합계", "sum"),
+            )
+            .reset_index()
+        )
+        table["개강월"] = table["개강월"].dt.strftime("%Y-%m")
+        days = pd.Series(df["개강일"].to_numpy().astype("datetime64[D]"), index=df.index, name="개강일")
+        daily_table = (
+            df.groupby([days, types], observed=True, dropna=False)
+            .agg(
+                회차=("신청인원", "size"),
+                신청인원=("신청인원", "sum"),
+                교육비합계=("교육비합계", "sum"),
+            )
+            .reset_index()
+        )
+        return cls(table, int(df["훈련과정명"].nunique()), daily_table)
+
+    @property
+    def types(self) -> List[str]:
+        """큐브에 들어 있는 훈련유형 (유형 없이 조회한 빈 값 제외)"""
+        return sorted(t for t in self.table["훈련유형"].unique() if t)
+
+    def top_institutes(self, measure: str, n: int = 20) -> pd.Series:
+        """measure 합계 기준 상위 n개 훈련기관을 반환합니다."""
+        return self.by_institute()[measure].sort_values(ascending=False).head(n)
+
+    def top_institutes_by_type(self, measure: str, n: int = 20) -> pd.DataFrame:
+        """measure 합계 기준 상위 n개 훈련기관의 훈련유형별 measure 합계
+
+        훈련기관, 훈련유형, measure 열의 긴 형식이며, 훈련기관은 전체 합계 내림차순입니다.
+        """
+        top = self.top_institutes(measure, n)
+        table = self.table[self.table["훈련기관"].isin(top.index)]
+        by_type = table.groupby(["훈련기관", "훈련유형"], observed=True)[measure].sum().reset_index()
+        order = {name: rank for rank, name in enumerate(top.index)}
+        by_type = by_type.sort_values("훈련기관", key=lambda s: s.astype(object).map(order), kind="stable")
+        return by_type.reset_index(drop=True)
+
+    def by_institute(self) -> pd.DataFrame:
+        """훈련기관별 회차 수, 신청인원, 교육비합계 (훈련기관 인덱스)"""
+        return self.table.groupby("훈련기관", observed=True)[MEASURES].sum()
+
+    def monthly(self, measure: str = "신청인원", by_type: bool = False) -> pd.DataFrame:
+        """개강월별 measure 합계 (개강월 오름차순). by_type이면 훈련유형별로 나눕니다."""
+        keys = ["개강월", "훈련유형"] if by_type else "개강월"
+        return self.table.groupby(keys, observed=True)[measure].sum().reset_index()
+
+    def daily(self, measure: str = "신청인원", by_type: bool = False) -> pd.DataFrame:
+        """개강일별 measure 합계 (개강일 오름차순). by_type이면 훈련유형별로 나눕니다."""
+        keys = ["개강일", "훈련유형"] if by_type else "개강일"
+        return self.daily_table.groupby(keys, observed=True)[measure].sum().reset_index()
+
+    def summary(self) -> Dict[str, int]:
+        """요약 지표 (훈련과정 수, 회차 수, 신청인원, 교육비합계)"""
+        return {
+            "훈련과정수": self.course_count,
+            "회차수": int(self.table["회차"].sum()),
+            "신청인원": int(self.table["신청인원"].sum()),
+            "교육비합계": int(self.table["교육비합계"].sum()),
+        }
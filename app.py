@@ -3,13 +3,17 @@ import streamlit as st
 import pandas as pd
 import requests
 import xml.etree.ElementTree as ET
-from io import BytesIO
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import os
+# 프로젝트 모듈은 불러올 때 설정(HRD_*, WORK24_*)을 읽으므로 .env를 먼저 불러옵니다.
+load_dotenv()
+from instrument import redact_text
+from work24 import fetch_range
+from frame import build_frame
+from export import XLSX_MIME, write_xlsx
 
 # .env 파일에서 인증키 불러오기
-load_dotenv()
 DEFAULT_AUTH_KEY = os.getenv("AUTH_KEY", "")
 
 st.set_page_config(layout="wide")
@@ -83,48 +87,24 @@ if st.button("데이터 수집"):
         s_date = start_date.strftime("%Y%m%d")
         e_date = end_date.strftime("%Y%m%d")
 
-        BASE_URL = 'https://www.work24.go.kr/cm/openApi/call/hr/callOpenApiSvcInfo311L01.do'
-        results = []
-
-        for page in range(1, 1000):
-            params = {
-                'authKey': auth_key,
-                'returnType': 'XML',
-                'outType': '1',
-                'pageNum': str(page),
-                'pageSize': '100',
-                'srchTraStDt': s_date,
-                'srchTraEndDt': e_date,
-                'crseTracseSe': crse_type_code,
-                'sort': 'ASC',
-                'sortCol': 'TRNG_BGDE'
-            }
-
-            try:
-                res = requests.get(BASE_URL, params=params, timeout=30)
-                root = ET.fromstring(res.content)
-                rows = root.find('srchList')
-                if rows is None:
-                    break
-                for item in rows.findall('scn_list'):
-                    기관 = item.findtext('subTitle', '')
-                    과정 = item.findtext('title', '')
-                    회차 = item.findtext('trprDegr', '')
-                    개강일 = item.findtext('traStartDate', '')
-                    신청인원 = item.findtext('regCourseMan', '0')
-                    교육비 = item.findtext('realMan', '0')
-                    교육비합계 = int(신청인원) * int(교육비)
-                    results.append([기관, 과정, 회차, 개강일, int(신청인원), int(교육비), 교육비합계])
-                if not rows.findall('scn_list'):
-                    break
-            except:
-                break
+        params = {
+            'authKey': auth_key,
+            'srchTraStDt': s_date,
+            'srchTraEndDt': e_date,
+            'crseTracseSe': crse_type_code,
+        }
+        try:
+            results = fetch_range(params)
+        except (requests.RequestException, ET.ParseError) as e:
+            st.error(f"데이터를 가져오는 중 오류가 발생했습니다: {redact_text(e)}")
+            results = []
+        else:
+            if not results.complete:
+                st.warning(f"일부 페이지({len(results.failed_pages)}개)를 가져오지 못해 결과가 불완전합니다.")
 
         if results:
-            df = pd.DataFrame(results, columns=["훈련기관명", "훈련과정명", "회차", "개강일", "신청인원", "교육비", "교육비합계"])
-            df["신청인원"] = df["신청인원"].astype(int)
-            df["교육비"] = df["교육비"].astype(int)
-            df["교육비합계"] = df["교육비합계"].astype(int)
+            df = build_frame(results, ["훈련기관", "훈련과정명", "회차", "개강일", "신청인원", "교육비", "교육비합계"])
+            df = df.rename(columns={"훈련기관": "훈련기관명"})
 
             st.markdown("### 📊 데이터 분석 결과")
             total_rows = len(df)
@@ -132,13 +112,11 @@ if st.button("데이터 수집"):
             st.write(df.style.format({"신청인원": "{:,}", "교육비": "{:,}", "교육비합계": "{:,}"}).hide_index())
 
             now = datetime.now().strftime("%Y%m%d_%H%M")
-            excel_buffer = BytesIO()
-            df.to_excel(excel_buffer, index=False, engine="openpyxl")
             st.download_button(
                 label="📥 Excel 다운로드",
-                data=excel_buffer.getvalue(),
+                data=write_xlsx({"Sheet1": df}),
                 file_name=f"훈련과정_목록_{now}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                mime=XLSX_MIME
             )
         else:
             st.warning("조건에 맞는 데이터가 없습니다.")
@@ -1,20 +1,25 @@
 import streamlit as st
-import pandas as pd
 import requests
 import xml.etree.ElementTree as ET
 import datetime
-import io
 import os
 from dotenv import load_dotenv
-from typing import Dict, List, Optional
+from typing import Dict, List
 import logging
+# 프로젝트 모듈은 불러올 때 설정(HRD_*, WORK24_*)을 읽으므로 .env를 먼저 불러옵니다.
+load_dotenv()
+from instrument import redact_text
+from work24 import MAX_RANGE_DAYS, fetch_range
+from work24_parser import TrainingRecord
+from frame import build_frame, frame_hash
+from aggregate import AggregateCube
+from export import XLSX_MIME, exports, write_xlsx
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # 1. 환경변수 로드
-load_dotenv()
 AUTH_KEY = os.getenv("AUTH_KEY") or st.secrets["AUTH_KEY"]
 if not AUTH_KEY:
     st.error("❗ API 키가 설정되어 있지 않습니다. Streamlit Cloud의 Secrets 설정을 확인해주세요.")
@@ -143,65 +148,31 @@ def validate_date_range(start_date: datetime.date, end_date: datetime.date) -> b
     if start_date > end_date:
         st.error("시작일은 종료일보다 이후일 수 없습니다.")
         return False
-    if (end_date - start_date).days > 365:
-        st.error("조회 기간은 최대 1년을 초과할 수 없습니다.")
+    if (end_date - start_date).days > MAX_RANGE_DAYS:
+        st.error("조회 기간은 최대 5년을 초과할 수 없습니다.")
         return False
     return True
 
-def parse_xml_response(content: bytes) -> Optional[ET.Element]:
-    """XML 응답을 파싱하고 유효성을 검사합니다."""
+def fetch_training_data(params: Dict[str, str]) -> List[TrainingRecord]:
+    """훈련 데이터를 가져옵니다."""
     try:
-        root = ET.fromstring(content)
-        if root.find("srchList") is None:
-            st.error("API 응답 형식이 올바르지 않습니다.")
-            return None
-        return root
+        # 긴 기간은 월 단위로 나눠 동시에 수집합니다.
+        rows = fetch_range(params)
     except ET.ParseError:
         st.error("API 응답을 파싱하는 중 오류가 발생했습니다.")
-        return None
-
-def fetch_training_data(params: Dict[str, str]) -> List[Dict]:
-    """훈련 데이터를 가져옵니다."""
-    results = []
-    BASE_URL = "https://www.work24.go.kr/cm/openApi/call/hr/callOpenApiSvcInfo311L01.do"
-    
-    try:
-        for page in range(1, 1000):
-            params["pageNum"] = str(page)
-            response = requests.get(BASE_URL, params=params, timeout=30)
-            response.raise_for_status()
-            
-            root = parse_xml_response(response.content)
-            if root is None:
-                break
-                
-            srch_list = root.find("srchList")
-            rows = srch_list.findall("scn_list") if srch_list is not None else []
-            
-            if not rows:
-                break
-                
-            for row in rows:
-                try:
-                    result = {
-                        "훈련기관": row.findtext("subTitle", "").strip(),
-                        "훈련과정명": row.findtext("title", "").strip(),
-                        "회차": row.findtext("trprDegr", "").strip(),
-                        "개강일": row.findtext("traStartDate", "").strip(),
-                        "신청인원": int(row.findtext("regCourseMan", "0")),
-                        "교육비": int(row.findtext("realMan", "0")),
-                    }
-                    if all(result.values()):  # 모든 필드가 비어있지 않은 경우만 추가
-                        results.append(result)
-                except (ValueError, TypeError) as e:
-                    logger.warning(f"데이터 변환 중 오류 발생: {e}")
-                    continue
-                    
+        return []
     except requests.RequestException as e:
-        st.error(f"데이터를 가져오는 중 오류가 발생했습니다: {str(e)}")
+        st.error(f"데이터를 가져오는 중 오류가 발생했습니다: {redact_text(e)}")
         return []
-        
-    return results
+    
+    if not rows.complete:
+        st.warning(f"일부 페이지({len(rows.failed_pages)}개)를 가져오지 못해 결과가 불완전합니다.")
+    
+    # 모든 필드가 비어있지 않은 경우만 추가
+    return [
+        row for row in rows
+        if all((row.institute, row.title, row.degree, row.start_date, row.applicants, row.fee))
+    ]
 
 # 3. 페이지 제목 (카드 위에 명확히 표시)
 st.markdown("<div class='title'>사업주훈련(고용24) 분석 대시보드</div>", unsafe_allow_html=True)
@@ -252,27 +223,16 @@ if st.button("데이터 수집 시작"):
         results = fetch_training_data(params)
         
         if results:
-            df = pd.DataFrame(results)
-            df["교육비합계"] = df["신청인원"] * df["교육비"]
+            # 메모리 최적화는 frame.SCHEMA의 dtype으로 생성 시점에 적용됩니다.
+            # (교육비합계는 int64로 유지해 21억 원 초과 시 넘치지 않도록 합니다.)
+            df = build_frame(results, ["훈련기관", "훈련과정명", "회차", "개강일", "신청인원", "교육비", "교육비합계"])
             
-            # 메모리 최적화를 위해 데이터 타입 조정
-            df = df.astype({
-                "신청인원": "int32",
-                "교육비": "int32",
-                "교육비합계": "int32"
-            })
-            
-            grouped = (
-                df.groupby("훈련기관")
-                .agg(
-                    회차=("회차", "count"),
-                    신청인원=("신청인원", "sum"),
-                    교육비합계=("교육비합계", "sum"),
-                )
-                .reset_index()
-            )
+            # 기관별 집계는 수집 시 한 번만 큐브에서 만들어 세션에 보관합니다.
+            cube = AggregateCube.from_frame(df, crse_type)
+            grouped = cube.by_institute().reset_index()
             
             st.session_state.df_raw = df
+            st.session_state.data_hash = frame_hash(df)
             st.session_state.df_grouped = grouped
         else:
             st.error("❌ 조건에 맞는 데이터가 없습니다.")
@@ -323,19 +283,22 @@ if "df_grouped" in st.session_state:
         hide_index=True
     )
 
-    buf = io.BytesIO()
-    with pd.ExcelWriter(buf, engine='openpyxl') as writer:
-        st.session_state.df_raw.to_excel(writer, index=False, sheet_name='상세데이터')
-        df_grp.to_excel(writer, index=False, sheet_name='기관별집계')
-    buf.seek(0)
-    
-    ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    st.download_button(
-        "엑셀 파일 다운로드",
-        data=buf,
-        file_name=f"훈련과정_회차_목록_{ts}.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-    )
+    # 엑셀 파일은 요청했을 때만 만들고, 같은 데이터/정렬에서는 다시 만들지 않습니다.
+    export_kind = f"xlsx:{sort_option}"
+    if (st.session_state.data_hash, export_kind) in exports or st.button("엑셀 파일 만들기"):
+        xlsx = exports.get_or_build(
+            st.session_state.data_hash,
+            export_kind,
+            lambda: write_xlsx({"상세데이터": st.session_state.df_raw, "기관별집계": df_grp}),
+        )
+        
+        ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        st.download_button(
+            "엑셀 파일 다운로드",
+            data=xlsx,
+            file_name=f"훈련과정_회차_목록_{ts}.xlsx",
+            mime=XLSX_MIME,
+        )
 
     st.markdown("</div>", unsafe_allow_html=True)
 
@@ -5,24 +5,69 @@ import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import os
-import plotly.express as px
 import plotly.graph_objects as go
-from cachetools import TTLCache
 import logging
 from typing import Dict, List, Optional, Tuple
-import json
-import io
+import time
 from pytz import timezone  # 추가
+# 프로젝트 모듈은 불러올 때 설정(HRD_*, WORK24_*)을 읽으므로 .env를 먼저 불러옵니다.
+load_dotenv()
+from work24 import MAX_RANGE_DAYS, FetchResult, PageCallback, dedupe_records, split_course_types
+from cache_store import HIT, MISS, STALE, ResultCache, normalize_params
+from partition_store import PartitionStore, ProgressCallback, parse_day, sync_query
+from work24_parser import COURSE_TYPES, TrainingRecord
+from frame import build_frame, frame_hash
+from instrument import FetchStats, Timings, redact_text
+from aggregate import AggregateCube
+from charts import GRANULARITIES, TYPE_LAYOUTS, build_figures, cached_figures, format_krw_uk
+from search import DEFAULT_HIGHLIGHT, HighlightRules, SearchIndex, normalize
+from diff import CHANGED, NEW, REMOVED, institute_deltas, net_changes
+from table import PAGE_SIZES, SORT_COLUMNS, TableQuery, page_count, page_rows, select_rows
+from export import CSV_MIME, XLSX_MIME, exports, write_csv, write_xlsx
+from progressive import BackgroundFetch, RefreshSchedule
+from singleflight import fetches
+from revalidate import revalidator
+import archive
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# 캐시 설정 (1시간 TTL)
-cache = TTLCache(maxsize=100, ttl=3600)
+# 스피너를 띄우지 않아야 set_page_config보다 먼저 화면 요소가 생기지 않습니다.
+@st.cache_resource(show_spinner=False)
+def open_stores() -> Tuple[ResultCache, PartitionStore]:
+    """결과 캐시와 파티션 저장소를 프로세스에서 한 번만 엽니다.
 
-# 환경변수 로드
-load_dotenv()
+    Streamlit은 재실행마다 이 스크립트를 새로 실행하므로, 모듈 전역에 바로 만들면 재실행마다
+    새 인스턴스(와 스키마/PRAGMA 설정)가 생기고 백그라운드 갱신은 첫 인스턴스만 붙잡게 됩니다.
+    """
+    # 결과 캐시 (워커 재시작/프로세스 간 공유되는 디스크 캐시). 1시간이 지난 결과는
+    # 바로 보여주면서 백그라운드에서 다시 받고, 6시간이 지나면 새로 받을 때까지 기다립니다.
+    results = ResultCache(ttl=3600, hard_ttl=6 * 3600, max_entries=100)
+    # 개강일 단위 파티션 저장소 (기간을 옮긴 조회는 빠진 날짜만 수집)
+    return results, PartitionStore(ttl=3600)
+
+CACHE_COUNTERS = {HIT: "cache_hits", STALE: "cache_stale", MISS: "cache_misses"}
+# 오래된 결과를 보여준 세션은 백그라운드 갱신이 끝났을 즈음 캐시를 다시 확인합니다(초).
+STALE_RECHECK_SECONDS = 60
+
+# "전체"는 훈련유형별로 동시에 조회해 합칩니다(행마다 유형이 붙어 유형별 비교가 가능).
+ALL_COURSE_TYPES = ",".join(COURSE_TYPES)
+
+# 상세 데이터 표: 숫자 열은 숫자 그대로 두고 표시만 천 단위 구분 기호로 합니다.
+TABLE_COLUMN_CONFIG = {
+    "신청인원": st.column_config.NumberColumn("신청인원", format="localized"),
+    "교육비": st.column_config.NumberColumn("교육비", format="localized"),
+    "교육비합계": st.column_config.NumberColumn("교육비합계", format="localized"),
+    "개강일": st.column_config.DateColumn("개강일", format="YYYY-MM-DD"),
+}
+
+# 변동 사항 비교 기간 (며칠 전 스냅숏과 비교할지)
+CHANGE_WINDOWS = {"최근 24시간": 1, "최근 7일": 7, "최근 30일": 30}
+CHANGE_LABELS = {NEW: "신규", REMOVED: "사라짐", CHANGED: "변동"}
+
+# 성능 패널의 재실행별 계측을 JSON Lines로 덧붙여 기록할 파일(회귀 측정용, 선택)
+PERF_LOG = os.getenv("HRD_PERF_LOG")
 AUTH_KEY = os.getenv("AUTH_KEY") or st.secrets.get("AUTH_KEY", "")
 
 # 페이지 설정
@@ -32,6 +77,7 @@ st.set_page_config(
     layout="wide",  # 화면 가로 사이즈를 넓게 설정
     initial_sidebar_state="expanded"
 )
+cache, partitions = open_stores()
 
 # CSS 스타일
 st.markdown("""
@@ -124,201 +170,382 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-def validate_date_range(start_date: datetime.date, end_date: datetime.date) -> Tuple[bool, str]:
-    """날짜 범위의 유효성을 검사합니다."""
+def validate_date_range(start_date: datetime.date, end_date: datetime.date,
+                        max_days: Optional[int] = MAX_RANGE_DAYS) -> Tuple[bool, str]:
+    """날짜 범위의 유효성을 검사합니다. max_days가 None이면 기간 제한이 없습니다(아카이브 조회)."""
     if start_date > end_date:
         return False, "시작일은 종료일보다 이후일 수 없습니다."
-    if (end_date - start_date).days > 365:
-        return False, "조회 기간은 최대 1년을 초과할 수 없습니다."
+    if max_days is not None and (end_date - start_date).days > max_days:
+        return False, "조회 기간은 최대 5년을 초과할 수 없습니다."
     return True, ""
 
-def fetch_training_data(params: Dict[str, str]) -> List[Dict]:
-    """훈련 데이터를 가져옵니다."""
-    cache_key = json.dumps(params, sort_keys=True)
-    if cache_key in cache:
-        return cache[cache_key]
-    
-    results = []
-    BASE_URL = "https://www.work24.go.kr/cm/openApi/call/hr/callOpenApiSvcInfo311L01.do"
-    
-    try:
-        for page in range(1, 1000):
-            # API 요청 파라미터 설정 (2025.5.21 변경사항 반영)
-            request_params = {
-                "authKey": params["authKey"],
-                "returnType": "XML",
-                "outType": "1",
-                "pageNum": str(page),
-                "pageSize": "100",
-                "srchTraStDt": params["srchTraStDt"],
-                "srchTraEndDt": params["srchTraEndDt"],
-                "crseTracseSe": params.get("crseTracseSe", "C0041A"),  # 기본값을 HRD 아카이브로 설정
-                "sort": "ASC",
-                "sortCol": "TRNG_BGDE"  # 변경된 정렬 파라미터
-            }
-            
-            logger.info(f"API 요청 파라미터: {request_params}")
-            
-            response = requests.get(BASE_URL, params=request_params, timeout=30)
-            response.raise_for_status()
-            
-            # API 응답 내용 로깅
-            logger.info(f"API 응답 상태 코드: {response.status_code}")
-            logger.info(f"API 응답 헤더: {dict(response.headers)}")
-            
-            root = ET.fromstring(response.content)
-            srch_list = root.find("srchList")
-            if srch_list is None:
-                logger.warning("srchList를 찾을 수 없습니다.")
-                break
-                
-            rows = srch_list.findall("scn_list")
-            if not rows:
-                logger.info(f"페이지 {page}에서 데이터가 없습니다.")
-                break
-                
-            logger.info(f"페이지 {page}에서 {len(rows)}개의 데이터를 찾았습니다.")
-            
-            for row in rows:
-                try:
-                    result = {
-                        "훈련기관": row.findtext("subTitle", "").strip(),
-                        "훈련과정명": row.findtext("title", "").strip(),
-                        "회차": row.findtext("trprDegr", "").strip(),
-                        "개강일": row.findtext("traStartDate", "").strip(),
-                        "신청인원": int(row.findtext("regCourseMan", "0")),
-                        "교육비": int(row.findtext("realMan", "0")),
-                        "자격증": row.findtext("certificate", "").strip(),  # 추가된 자격증 항목
-                    }
-                    result["교육비합계"] = result["신청인원"] * result["교육비"]
-                    results.append(result)
-                    logger.info(f"데이터 추가: {result['훈련기관']} - {result['훈련과정명']}")
-                except (ValueError, TypeError) as e:
-                    logger.warning(f"데이터 변환 중 오류 발생: {e}")
-                    continue
-                    
-    except requests.RequestException as e:
-        logger.error(f"API 요청 중 오류 발생: {str(e)}")
-        st.error(f"데이터를 가져오는 중 오류가 발생했습니다: {str(e)}")
-        return []
-    
-    logger.info(f"총 {len(results)}개의 데이터를 가져왔습니다.")
-    cache[cache_key] = results
+def collect_training_data(params: Dict[str, str], stats: FetchStats, notify=None,
+                          max_age: Optional[float] = None) -> FetchResult:
+    """파티션 저장소를 동기화해 수집하고, 빠짐없이 받았으면 결과 캐시에 저장합니다.
+
+    같은 조건의 수집이 이미 진행 중이면(다른 세션, 백그라운드 갱신 포함) 새로 수집하지 않고
+    그 결과를 함께 받습니다. notify("page", rows)/notify("progress", ...)로 진행 이벤트를 받고,
+    max_age를 주면(백그라운드 갱신) 캐시를 확인하지 않고 그보다 오래된 날짜를 다시 받습니다.
+    """
+    def run(notify) -> FetchResult:
+        if max_age is None:
+            # 기다리는 동안 다른 요청이 캐시를 채웠을 수 있으므로 한 번 더 확인합니다.
+            cached = cache.get(params)
+            if cached is not None:
+                return FetchResult(TrainingRecord(*row) for row in cached)
+        # 기본값을 HRD 아카이브로 설정
+        query = {"crseTracseSe": "C0041A", **params}
+        # 저장소(배치 수집으로 미리 채워졌을 수 있음)에 없는 개강일 구간만 새로 수집합니다.
+        results = sync_query(
+            partitions, query, stats=stats,
+            on_progress=lambda done, total, rows: notify("progress", done, total, rows),
+            on_page=lambda rows: notify("page", rows),
+            max_age=max_age,
+        )
+        if results.complete:
+            # 일부 페이지가 빠진 결과는 캐시하지 않습니다.
+            cache.set(params, results)
+        return results
+
+    results, shared = fetches.do(normalize_params(params), run, notify)
+    if shared:
+        stats.count("singleflight_shared")
     return results
 
-def format_krw_uk(value):
-    """숫자를 억원 단위(소수점 1자리)로 변환해주는 함수"""
-    return f"{value/1e8:.1f}억"
+def refresh_training_data(params: Dict[str, str], max_age: float) -> FetchResult:
+    """백그라운드 갱신(revalidate.py)용 수집. 계측 요약은 갱신마다 한 줄 로그로 남깁니다."""
+    stats = FetchStats(f"백그라운드 갱신 {normalize_params(params)}")
+    try:
+        return collect_training_data(params, stats, max_age=max_age)
+    finally:
+        stats.log_summary(logger)
 
-def format_comma(value):
-    """천단위 쉼표로 변환"""
-    return f"{value:,}"
+def fetch_training_data(params: Dict[str, str], on_progress: Optional[ProgressCallback] = None,
+                        stats: Optional[FetchStats] = None,
+                        on_page: Optional[PageCallback] = None) -> FetchResult:
+    """훈련 데이터를 가져옵니다. 긴 기간은 월 단위 구간으로 나눠 동시에 수집합니다.
 
-def create_summary_metrics(df: pd.DataFrame) -> None:
+    백그라운드 스레드에서도 부를 수 있도록 화면에는 아무것도 그리지 않고,
+    요청 오류는 그대로 전달합니다(화면 표시는 load_dataset에서 합니다).
+    soft TTL이 지난 캐시 결과는 바로 반환하고 백그라운드에서 다시 받습니다.
+    """
+    stats = stats or FetchStats()
+    cached, state = cache.lookup(params)
+    stats.count(CACHE_COUNTERS[state])
+    if cached is not None:
+        if state == STALE:
+            revalidator.refresh(cache, params, refresh_training_data)
+        return FetchResult(TrainingRecord(*row) for row in cached)
+
+    def listen(kind: str, *event) -> None:
+        callback = on_progress if kind == "progress" else on_page
+        if callback:
+            callback(*event)
+
+    return collect_training_data(params, stats, listen)
+
+def create_summary_metrics(cube: AggregateCube) -> None:
     """요약 지표를 생성합니다."""
+    summary = cube.summary()
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("총 훈련과정 수", f"{df['훈련과정명'].nunique():,}개")
+        st.metric("총 훈련과정 수", f"{summary['훈련과정수']:,}개")
     with col2:
-        st.metric("총 회차 개수", f"{len(df):,}회차")
+        st.metric("총 회차 개수", f"{summary['회차수']:,}회차")
     with col3:
-        st.metric("총 신청인원", f"{df['신청인원'].sum():,}명")
+        st.metric("총 신청인원", f"{summary['신청인원']:,}명")
     with col4:
-        st.metric("총 교육비 합계", format_krw_uk(df['교육비합계'].sum()))
+        st.metric("총 교육비 합계", format_krw_uk(summary['교육비합계']))
 
-def create_visualizations(df: pd.DataFrame) -> None:
+def create_visualizations(figures: List[go.Figure], timings: Optional[Timings] = None) -> None:
     """데이터 시각화를 생성합니다."""
+    timings = timings or Timings()
     st.markdown("### 📊 HRD아카이브 데이터 시각화")
-    # 밝은 회색~진한 회색 그라데이션
-    gray_palette = [
-        '#eeeeee', '#dddddd', '#cccccc', '#bbbbbb', '#aaaaaa',
-        '#999999', '#888888', '#777777', '#666666', '#555555',
-        '#eeeeee', '#dddddd', '#cccccc', '#bbbbbb', '#aaaaaa',
-        '#999999', '#888888', '#777777', '#666666', '#555555'
-    ]
-    highlight_color = '#FF6F61'  # 알파코 강조 색상
-
-    # 1. 훈련기관별 신청인원 분포 (최대 20개)
-    top_institutes = df.groupby("훈련기관")["신청인원"].sum().sort_values(ascending=False).head(20)
-    institutes = top_institutes.index.tolist()
-    values = top_institutes.values.tolist()
-    colors = [highlight_color if '알파코' in name else gray_palette[i % len(gray_palette)] for i, name in enumerate(institutes)]
-    fig1 = go.Figure(data=[
-        go.Bar(
-            x=institutes,
-            y=values,
-            marker_color=colors,
-            text=[format_comma(v) for v in values],
-            textposition='outside',
-        )
-    ])
-    fig1.update_layout(
-        title="상위 20개 훈련기관 신청인원",
-        font=dict(size=16),  # 폰트 크기 증가
-        title_font=dict(size=18),
-        plot_bgcolor='#fafafa',
-        paper_bgcolor='#fafafa',
-        yaxis_title="신청인원",
-        xaxis_title="훈련기관",
-        margin=dict(t=80, b=60),  # 마진 조정
-        height=500,  # 그래프 높이 증가
-        yaxis_tickformat=",d",
-        uniformtext_minsize=10,
-        uniformtext_mode='hide'
+    for fig in figures:
+        with timings.span(f"차트: {fig.layout.title.text}"):
+            st.plotly_chart(fig, use_container_width=True)
+
+def show_preview(rows: List[TrainingRecord], refresh: int) -> None:
+    """수집 중인 중간 결과로 요약 지표, 그래프, 표 일부를 그립니다."""
+    df = build_frame(dedupe_records(rows))
+    cube = AggregateCube.from_frame(df)
+    st.caption(f"수집 중... 지금까지 받은 {len(df):,}건으로 먼저 보여드립니다.")
+    create_summary_metrics(cube)
+    # 다시 그릴 때마다 요소 ID가 겹치지 않도록 갱신 번호를 키에 붙입니다.
+    for index, fig in enumerate(build_figures(cube)):
+        st.plotly_chart(fig, use_container_width=True, key=f"preview-{refresh}-{index}")
+    st.dataframe(
+        df.tail(PAGE_SIZES[0]), column_config=TABLE_COLUMN_CONFIG, hide_index=True,
+        use_container_width=True, key=f"preview-table-{refresh}",
     )
-    st.plotly_chart(fig1, use_container_width=True)
-
-    # 2. 훈련기관별 교육비 합계 분포 (최대 20개)
-    top_institutes_fee = df.groupby("훈련기관")["교육비합계"].sum().sort_values(ascending=False).head(20)
-    institutes_fee = top_institutes_fee.index.tolist()
-    values_fee = top_institutes_fee.values.tolist()
-    colors_fee = [highlight_color if '알파코' in name else gray_palette[i % len(gray_palette)] for i, name in enumerate(institutes_fee)]
-    fig2 = go.Figure(data=[
-        go.Bar(
-            x=institutes_fee,
-            y=[v/1e8 for v in values_fee],
-            marker_color=colors_fee,
-            text=[format_krw_uk(v) for v in values_fee],
-            textposition='outside',
+
+def fetch_progressively(params: Dict[str, str], stats: FetchStats) -> FetchResult:
+    """수집은 백그라운드 스레드에서 하고, 받은 페이지로 화면을 점진적으로 다시 그립니다."""
+    progress = st.empty()
+    preview = st.empty()
+    job = BackgroundFetch(lambda on_page, on_progress: fetch_training_data(params, on_progress, stats, on_page))
+    schedule = RefreshSchedule()
+    rows: List[TrainingRecord] = []
+    for kind, value in job.events():
+        if kind == "progress":
+            done, total, fetched = value
+            progress.progress(done / total, text=f"{done}/{total}개 구간 수집 완료 ({fetched:,}건)")
+        else:
+            rows.extend(value)
+            if schedule.add_page():
+                with stats.span("preview"), preview.container():
+                    show_preview(rows, schedule.refreshes)
+    stats.count("preview_refreshes", schedule.refreshes)
+    try:
+        return job.result()
+    finally:
+        progress.empty()
+        preview.empty()
+
+def open_archive() -> Optional["archive.Archive"]:
+    """HRD 아카이브(Parquet)가 있으면 반환합니다(pyarrow가 없거나 비어 있으면 None)."""
+    if not archive.available():
+        return None
+    history = archive.Archive()
+    return history if history.partitions() else None
+
+def read_archive(history: "archive.Archive", params: Dict[str, str], stats: FetchStats) -> pd.DataFrame:
+    """조회 조건의 기간/유형 파티션만 아카이브에서 읽습니다."""
+    with st.spinner("HRD 아카이브를 읽는 중..."), stats.span("archive_read"):
+        return history.read(
+            datetime.strptime(params["srchTraStDt"], "%Y%m%d").date(),
+            datetime.strptime(params["srchTraEndDt"], "%Y%m%d").date(),
+            split_course_types(params["crseTracseSe"]),
         )
-    ])
-    fig2.update_layout(
-        title="상위 20개 훈련기관 교육비 합계",
-        font=dict(size=16),  # 폰트 크기 증가
-        title_font=dict(size=18),
-        plot_bgcolor='#fafafa',
-        paper_bgcolor='#fafafa',
-        yaxis_title="교육비 합계(억원)",
-        xaxis_title="훈련기관",
-        margin=dict(t=600, b=240, l=180, r=180),  # 내부 여백을 3배로 증가
-        height=500,  # 그래프 높이 증가
-        yaxis_tickformat=".1f",
-        uniformtext_minsize=10,
-        uniformtext_mode='hide'
-    )
-    st.plotly_chart(fig2, use_container_width=True)
-
-    # 3. 월별 신청인원 추이만 남김
-    df["개강월"] = pd.to_datetime(df["개강일"]).dt.strftime("%Y-%m")
-    monthly_data = df.groupby("개강월")["신청인원"].sum().reset_index()
-    fig3 = px.line(
-        monthly_data,
-        x="개강월",
-        y="신청인원",
-        title="월별 신청인원 추이",
-        labels={"신청인원": "신청인원", "개강월": "개강월"},
-        markers=True
-    )
-    fig3.update_traces(line_color='#888888')
-    fig3.update_layout(
-        font=dict(size=16),  # 폰트 크기 증가
-        title_font=dict(size=18),
-        plot_bgcolor='#fafafa',
-        paper_bgcolor='#fafafa',
-        yaxis_tickformat=",d",
-        height=500  # 그래프 높이 증가
+
+def load_dataset(params: Dict[str, str], timings: Optional[FetchStats] = None,
+                 history: Optional["archive.Archive"] = None) -> Optional[Dict]:
+    """조회 조건이 바뀌었거나 데이터가 TTL을 넘었을 때만 데이터를 다시 불러옵니다.
+
+    불러온 데이터와 파생 결과(memo)는 세션에 보관하므로, 조건과 무관한 위젯
+    조작으로 인한 재실행에서는 수집/집계/그래프 생성을 다시 하지 않습니다.
+    수집하는 동안에는 받은 페이지로 중간 결과를 먼저 보여줍니다.
+    history(HRD 아카이브)를 주면 고용24 대신 아카이브에서 읽습니다.
+    """
+    query_key = normalize_params(params) + ("|archive" if history else "")
+    dataset = st.session_state.get("dataset")
+    if dataset and dataset["query_key"] == query_key and time.time() - dataset["loaded_at"] < cache.ttl:
+        if timings:
+            timings.count("dataset_reuses")
+        return dataset
+
+    if history:
+        df = read_archive(history, params, timings or FetchStats(f"아카이브 조회 {query_key}"))
+        if df.empty:
+            st.session_state.pop("dataset", None)
+            return None
+        return store_dataset(query_key, df, time.time(), params["crseTracseSe"], dataset)
+
+    with st.spinner("데이터를 수집하는 중..."):
+        # 수집/변환 시간과 행/페이지/바이트 수는 조회가 끝날 때 한 줄로 요약합니다.
+        stats = timings or FetchStats(f"대시보드 조회 {query_key}")
+        try:
+            with stats.span("fetch_training_data"):
+                results = fetch_progressively(params, stats)
+        except (requests.RequestException, ET.ParseError) as e:
+            logger.error(f"API 요청 중 오류 발생: {redact_text(e)}")
+            st.error(f"데이터를 가져오는 중 오류가 발생했습니다: {redact_text(e)}")
+            results = FetchResult()
+        if not results.complete:
+            st.warning(f"일부 페이지({len(results.failed_pages)}개)를 가져오지 못해 결과가 불완전합니다. 잠시 후 다시 조회해 주세요.")
+        if not results:
+            stats.log_summary(logger)
+            st.session_state.pop("dataset", None)
+            return None
+        with stats.span("convert"):
+            df = build_frame(results)
+        stats.log_summary(logger)
+        if not results.complete:
+            loaded_at = 0.0
+        elif stats.summary().get("cache_stale"):
+            loaded_at = time.time() - cache.ttl + STALE_RECHECK_SECONDS
+        else:
+            loaded_at = time.time()
+        # 일부만 수집된 데이터는 다음 재실행 때 다시 수집합니다.
+        return store_dataset(query_key, df, loaded_at, params["crseTracseSe"], dataset)
+
+def store_dataset(query_key: str, df: pd.DataFrame, loaded_at: float, course_type: str,
+                  previous: Optional[Dict]) -> Dict:
+    """불러온 데이터프레임으로 데이터셋을 만들어 세션에 보관합니다."""
+    data_hash = frame_hash(df)
+    # 내용이 같으면 이전에 만든 그래프/파일을 그대로 씁니다.
+    if previous and previous["hash"] == data_hash:
+        memo = previous["memo"]
+    else:
+        memo = {}
+    dataset = {
+        "query_key": query_key,
+        "loaded_at": loaded_at,
+        "hash": data_hash,
+        "df": df,
+        # 집계 큐브는 데이터를 불러올 때 한 번만 만듭니다.
+        "cube": AggregateCube.from_frame(df, course_type),
+        "memo": memo,
+    }
+    st.session_state.dataset = dataset
+    return dataset
+
+def memoized(dataset: Dict, key: str, build, timings: Optional[Timings] = None):
+    """데이터셋 해시 단위로 파생 결과를 한 번만 만듭니다."""
+    memo = dataset["memo"]
+    if key not in memo:
+        if timings:
+            timings.count("memo_misses")
+        memo[key] = build()
+    elif timings:
+        timings.count("memo_hits")
+    return memo[key]
+
+def narrow_dataset(dataset: Dict, text: str, timings: Optional[Timings] = None) -> Dict:
+    """검색어에 맞는 행만 남긴 데이터셋(검색 결과 전용 큐브, 해시, 메모 포함)을 반환합니다.
+
+    검색 색인은 데이터셋마다 한 번만 만들고, 마지막 검색 결과 하나를 메모에 보관합니다.
+    """
+    if not text:
+        return dataset
+    cached = dataset["memo"].get("search_view")
+    if cached and cached["search"] == text:
+        return cached
+    timings = timings or Timings()
+    index = memoized(dataset, "search_index", lambda: SearchIndex.from_frame(dataset["df"]), timings)
+    with timings.span("search"):
+        df = dataset["df"][index.row_mask(dataset["df"], text)]
+        view = {
+            "query_key": dataset["query_key"],
+            "loaded_at": dataset["loaded_at"],
+            "hash": f"{dataset['hash']}:search:{text}",
+            "df": df,
+            "cube": AggregateCube.from_frame(df),
+            "memo": {},
+            "search": text,
+        }
+    dataset["memo"]["search_view"] = view
+    return view
+
+def show_changes(params: Dict[str, str], search_text: str = "", timings: Optional[Timings] = None) -> None:
+    """조회 구간을 다시 수집하면서 기록된 변동(신규/사라진 회차, 기관별 신청인원 변화)을 보여줍니다.
+
+    변동은 파티션을 덮어쓸 때마다 저장소에 쌓이므로 여기서는 구간의 기록만 모읍니다.
+    """
+    timings = timings or Timings()
+    label = st.radio("비교 기간", list(CHANGE_WINDOWS), horizontal=True, key="change_window")
+    since = time.time() - CHANGE_WINDOWS[label] * 24 * 3600
+    start, end = parse_day(params["srchTraStDt"]), parse_day(params["srchTraEndDt"])
+    words = [normalize(word) for word in search_text.split()]
+    with timings.span("changes"):
+        changes = net_changes(
+            change
+            for crse in split_course_types(params["crseTracseSe"])
+            for change in partitions.changes(crse, start, end, since)
+        )
+        if words:
+            # 검색어가 있으면 화면의 다른 부분과 같이 훈련기관/훈련과정명으로 좁힙니다.
+            changes = [
+                change for change in changes
+                if all(word in normalize(change.institute) or word in normalize(change.title) for word in words)
+            ]
+    if not changes:
+        st.caption(f"{label} 동안 다시 수집하면서 바뀐 회차가 없습니다.")
+        return
+    col1, col2, col3 = st.columns(3)
+    col1.metric("신규 회차", f"{sum(change.kind == NEW for change in changes):,}회차")
+    col2.metric("사라진 회차", f"{sum(change.kind == REMOVED for change in changes):,}회차")
+    col3.metric("신청인원 변화", f"{sum(change.delta for change in changes):+,}명")
+    st.dataframe(institute_deltas(changes).head(20), use_container_width=True, hide_index=True)
+    with st.expander("변동 회차 목록"):
+        st.dataframe(
+            pd.DataFrame({
+                "구분": [CHANGE_LABELS[change.kind] for change in changes],
+                "훈련유형": [COURSE_TYPES.get(change.course_type, change.course_type) for change in changes],
+                "개강일": [change.start_date for change in changes],
+                "훈련기관": [change.institute for change in changes],
+                "훈련과정명": [change.title for change in changes],
+                "회차": [change.degree for change in changes],
+                "이전 신청인원": pd.array([change.old_applicants for change in changes], dtype="Int64"),
+                "현재 신청인원": pd.array([change.new_applicants for change in changes], dtype="Int64"),
+            }),
+            use_container_width=True, hide_index=True,
+        )
+
+def show_table(dataset: Dict, timings: Optional[Timings] = None) -> None:
+    """상세 데이터를 서버 쪽에서 필터/정렬하고 현재 페이지 행만 보여줍니다."""
+    df = dataset["df"]
+    col1, col2, col3 = st.columns(3)
+    institute = col1.text_input("훈련기관 검색", key="table_institute").strip()
+    title = col2.text_input("훈련과정명 검색", key="table_title").strip()
+    start = end = None
+    bounds = memoized(dataset, "date_bounds", lambda: (df["개강일"].min(), df["개강일"].max()))
+    if not pd.isna(bounds[0]):
+        first, last = bounds[0].date(), bounds[1].date()
+        period = col3.date_input("개강일", value=(first, last), min_value=first, max_value=last, key="table_dates")
+        if len(period) == 2 and tuple(period) != (first, last):
+            start, end = period
+    col1, col2, col3 = st.columns(3)
+    sort_by = col1.selectbox("정렬 기준", SORT_COLUMNS, key="table_sort")
+    ascending = col2.radio("정렬 방향", ["오름차순", "내림차순"], horizontal=True, key="table_order") == "오름차순"
+    page_size = col3.selectbox("페이지당 행 수", PAGE_SIZES, index=1, key="table_page_size")
+
+    query = TableQuery(institute, title, start, end, sort_by, ascending)
+    # 위치 배열은 마지막 조건 하나만 보관합니다(페이지 이동은 이 배열을 자르기만 함).
+    cached = dataset["memo"].get("table_rows")
+    if cached and cached[0] == query:
+        positions = cached[1]
+    else:
+        with (timings or Timings()).span("table_select"):
+            positions = select_rows(df, query)
+        dataset["memo"]["table_rows"] = (query, positions)
+
+    pages = page_count(len(positions), page_size)
+    if st.session_state.get("table_query") != (query, page_size):
+        st.session_state.table_query = (query, page_size)
+        st.session_state.table_page = 1
+    st.session_state.table_page = min(st.session_state.get("table_page", 1), pages)
+    page = st.number_input(f"페이지 (전체 {pages:,})", min_value=1, max_value=pages, step=1, key="table_page")
+    first_row = (page - 1) * page_size
+    st.caption(f"총 {len(positions):,}건 중 {min(first_row + 1, len(positions)):,}–"
+               f"{min(first_row + page_size, len(positions)):,}번째")
+    st.dataframe(
+        page_rows(df, positions, page, page_size),
+        column_config=TABLE_COLUMN_CONFIG,
+        hide_index=True,
+        use_container_width=True,
     )
-    st.plotly_chart(fig3, use_container_width=True)
+
+def perf_panel_enabled() -> bool:
+    """?perf=1 쿼리 파라미터나 사이드바 체크박스로 성능 패널을 켭니다."""
+    from_query = st.query_params.get("perf", "") in ("1", "true", "on")
+    return st.sidebar.checkbox("⏱️ 성능 패널", value=from_query, key="perf_panel")
+
+def show_perf_panel(timings: FetchStats, query_key: str) -> None:
+    """이번 재실행의 구간별 시간, 캐시 적중, 수집 바이트를 보여주고 JSON으로 내려받게 합니다."""
+    summary = timings.summary()
+    with st.expander("⏱️ 성능", expanded=True):
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("재실행 시간", f"{summary['elapsed_seconds'] * 1000:,.0f}ms")
+        col2.metric(
+            "결과 캐시 적중/오래됨/누락",
+            f"{summary.get('cache_hits', 0)}/{summary.get('cache_stale', 0)}/{summary.get('cache_misses', 0)}",
+        )
+        col3.metric("수집 바이트", f"{summary['bytes'] / 1e6:,.2f}MB")
+        col4.metric("수집 페이지", f"{summary['pages']:,}")
+        st.dataframe(pd.DataFrame(timings.rows()), use_container_width=True, hide_index=True)
+        st.caption(
+            f"데이터셋 재사용 {summary.get('dataset_reuses', 0)}회, "
+            f"파생 결과 재사용 {summary.get('memo_hits', 0)}회 / 새로 생성 {summary.get('memo_misses', 0)}회, "
+            f"프로세스 누적 결과 캐시 적중/오래됨/누락 "
+            f"{cache.counters[HIT]}/{cache.counters[STALE]}/{cache.counters[MISS]}, "
+            f"백그라운드 갱신 완료 {revalidator.refreshes}회 / 실패 {revalidator.failures}회 / 대기 {revalidator.pending()}건, "
+            f"동시 조회 합치기 직접 수집 {fetches.leaders}회 / 함께 받음 {fetches.shared}회 / 진행 중 {fetches.in_flight()}건"
+        )
+        st.download_button(
+            "성능 JSON 다운로드", timings.to_json(query=query_key), "perf.json", "application/json",
+            key="download-perf"
+        )
 
 def main():
     try:
@@ -328,6 +555,9 @@ def main():
         st.markdown('<h1 class="main-title">📊 HRD아카이브 대시보드</h1>', unsafe_allow_html=True)
         st.warning('서비스 점검 안내: 현재 페이지는 **수정 작업**으로 인해 일시 중단되었습니다.\n\n잠시 후 다시 이용해 주세요.')
         st.stop()
+    if AUTH_KEY:
+        # 자주 찾는 조회 조건은 만료되기 전에 미리 갱신합니다(프로세스에서 한 번만 시작).
+        revalidator.start(cache, refresh_training_data, {"authKey": AUTH_KEY})
     st.markdown('<h1 class="main-title">📊 HRD아카이브 대시보드</h1>', unsafe_allow_html=True)
 
     # 상단에 조건 설정 영역 배치 (상하 구조)
@@ -337,14 +567,7 @@ def main():
         st.markdown('**훈련유형**')
         training_type = st.selectbox(
             "훈련유형 선택",
-            options=[
-                ("전체", ""),
-                ("일반직무훈련", "C0041T"),
-                ("기업직업훈련카드", "C0041B"),
-                ("고숙련신기술훈련", "C0041N"),
-                ("HRD 아카이브", "C0041A"),
-                ("패키지구독형 원격", "C0041H")
-            ],
+            options=[("전체", ALL_COURSE_TYPES)] + [(label, code) for code, label in COURSE_TYPES.items()],
             format_func=lambda x: x[0]
         )[1]
     with col2:
@@ -377,56 +600,98 @@ def main():
         "crseTracseSe": training_type
     }
     
-    logger.info(f"시작일: {start_date}, 종료일: {end_date}")
+    logger.debug(f"시작일: {start_date}, 종료일: {end_date}")
     
-    is_valid, error_message = validate_date_range(start_date, end_date)
+    # 아카이브가 있으면 고용24 대신 아카이브에서 (기간 제한 없이) 조회할 수 있습니다.
+    history = open_archive()
+    if history:
+        months = [month for month, _ in history.partitions()]
+        if not st.sidebar.checkbox(
+            "HRD 아카이브에서 조회 (수집 없이, 기간 제한 없음)", key="use_archive",
+            help=f"{months[0]}~{months[-1]} 개강분을 Parquet 파일에서 읽습니다.",
+        ):
+            history = None
+
+    is_valid, error_message = validate_date_range(start_date, end_date, None if history else MAX_RANGE_DAYS)
     if not is_valid:
         logger.error(f"날짜 범위 유효성 검사 실패: {error_message}")
         st.error(error_message)
         return
 
-    with st.spinner("데이터를 수집하는 중..."):
-        results = fetch_training_data(params)
-        if results:
-            df = pd.DataFrame(results)
-            logger.info(f"데이터프레임 생성 완료: {len(df)}행")
-            st.markdown("### 📈 요약 지표")
-            create_summary_metrics(df)
-            create_visualizations(df)
-            st.markdown("### 📋 상세 데이터")
-            st.dataframe(
-                df.style.format({
-                    "신청인원": "{:,}",
-                    "교육비": "{:,}",
-                    "교육비합계": "{:,}"
-                }),
-                use_container_width=True
+    # 이번 재실행의 구간 시간과 캐시 적중을 모읍니다(성능 패널, HRD_PERF_LOG).
+    timings = FetchStats("대시보드 재실행")
+    show_perf = perf_panel_enabled()
+    highlight = HighlightRules.parse(
+        st.sidebar.text_input("강조할 기관 (쉼표로 구분)", value=DEFAULT_HIGHLIGHT, key="highlight")
+    )
+    dataset = load_dataset(params, timings, history)
+    if dataset is not None:
+        search_text = st.text_input(
+            "🔍 훈련기관/훈련과정명 검색", key="search", placeholder="예: 알파코, 데이터 분석"
+        ).strip()
+        # 검색어가 있으면 요약 지표, 그래프, 표, 내보내기를 모두 검색 결과로 좁힙니다.
+        dataset = narrow_dataset(dataset, search_text, timings)
+    if dataset is None:
+        logger.warning("조건에 맞는 데이터가 없습니다.")
+        st.warning("조건에 맞는 데이터가 없습니다.")
+    elif dataset["df"].empty:
+        st.info(f"'{search_text}'에 해당하는 훈련기관/훈련과정이 없습니다.")
+    else:
+        df = dataset["df"]
+        st.markdown("### 📈 요약 지표")
+        with timings.span("create_summary_metrics"):
+            create_summary_metrics(dataset["cube"])
+        col1, col2 = st.columns(2)
+        type_layout = TYPE_LAYOUTS[0]
+        if len(dataset["cube"].types) > 1:
+            type_layout = col1.radio("훈련유형 표시", TYPE_LAYOUTS, horizontal=True, key="type_layout")
+        granularity = col2.radio("신청인원 추이 단위", GRANULARITIES, horizontal=True, key="granularity")
+        # 그래프는 세션과 무관하게 (데이터 해시, 종류, 옵션) 단위로 프로세스 안에서 재사용합니다.
+        with timings.span("build_figures"):
+            figures = cached_figures(
+                dataset["hash"], dataset["cube"], type_layout, highlight, granularity, timings
             )
-            st.markdown("### 💾 데이터 내보내기")
-            col1, col2 = st.columns(2)
-            with col1:
-                csv = df.to_csv(index=False).encode('utf-8-sig')
+        create_visualizations(figures, timings)
+        if history is None:
+            # 아카이브는 변동을 기록하지 않으므로 고용24에서 수집한 조회에서만 보여줍니다.
+            st.markdown("### 🔄 변동 사항")
+            show_changes(params, search_text, timings)
+        st.markdown("### 📋 상세 데이터")
+        with timings.span("table"):
+            show_table(dataset, timings)
+        st.markdown("### 💾 데이터 내보내기")
+        # 내보내기 파일은 요청했을 때만 만들고, 같은 데이터에서는 다시 만들지 않습니다.
+        data_hash = dataset["hash"]
+        col1, col2 = st.columns(2)
+        with col1:
+            if (data_hash, "csv") in exports or st.button("CSV 파일 만들기", key='prepare-csv'):
+                with timings.span("export: csv"):
+                    data = exports.get_or_build(data_hash, "csv", lambda: write_csv(df))
                 st.download_button(
                     "CSV 다운로드",
-                    csv,
+                    data,
                     "training_data.csv",
-                    "text/csv",
+                    CSV_MIME,
                     key='download-csv'
                 )
-            with col2:
-                with io.BytesIO() as buffer:
-                    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-                        df.to_excel(writer, index=False)
-                    st.download_button(
-                        "Excel 다운로드",
-                        buffer.getvalue(),
-                        "training_data.xlsx",
-                        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        key='download-excel'
-                    )
-        else:
-            logger.warning("조건에 맞는 데이터가 없습니다.")
-            st.warning("조건에 맞는 데이터가 없습니다.")
+        with col2:
+            if (data_hash, "xlsx") in exports or st.button("Excel 파일 만들기", key='prepare-excel'):
+                with timings.span("export: xlsx"):
+                    data = exports.get_or_build(data_hash, "xlsx", lambda: write_xlsx({"Sheet1": df}))
+                st.download_button(
+                    "Excel 다운로드",
+                    data,
+                    "training_data.xlsx",
+                    XLSX_MIME,
+                    key='download-excel'
+                )
+
+    query_key = normalize_params(params)
+    if PERF_LOG:
+        with open(PERF_LOG, "a", encoding="utf-8") as f:
+            f.write(timings.to_json(indent=None, query=query_key) + "\n")
+    if show_perf:
+        show_perf_panel(timings, query_key)
 
     # 푸터
     st.markdown("""
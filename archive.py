@@ -0,0 +1,244 @@
+"""HRD 아카이브: 훈련 데이터 Parquet 보관소
+
+수집한 회차를 (개강 연월, 훈련유형) 파티션으로 나눈 Parquet 파일에 쌓아 두고,
+여러 해에 걸친 조회도 고용24를 다시 부르지 않고 필요한 파일과 열만 읽어 답합니다.
+
+    .hrd_cache/archive/year_month=2025-03/course_type=C0041T/data.parquet
+
+읽을 때는 pyarrow.dataset으로 열 선택(projection)과 조건 내려보내기(predicate pushdown)를
+합니다. 개강일 조건은 먼저 연월 디렉터리를 거르고, 파일 안에서는 개강일 순으로 정렬해
+쓴 행 그룹의 최소/최대 통계로 다시 거릅니다. 훈련유형은 디렉터리로, 훈련기관(부분 일치)은
+행 단위로 거릅니다. 로컬 파일은 메모리 맵으로 엽니다.
+
+pyarrow가 없으면 available()이 False이고 아카이브 기능만 쓸 수 없습니다.
+
+    python archive.py --start 2021-01-01 --end 2025-12-31 --institute 알파코
+"""
+import argparse
+import logging
+import os
+import shutil
+import sys
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+if __name__ == "__main__":
+    # CLI로 실행할 때는 설정(HRD_ARCHIVE_DIR, HRD_CACHE_DIR)을 읽기 전에 .env를 불러옵니다.
+    from dotenv import load_dotenv
+    load_dotenv()
+
+from cache_store import CACHE_DIR
+from frame import COLUMNS, apply_schema
+from work24 import month_windows
+from work24_parser import COURSE_TYPES, TrainingRecord
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    from pyarrow import fs
+except ImportError:  # 아카이브는 선택 기능입니다.
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR = os.getenv("HRD_ARCHIVE_DIR", os.path.join(CACHE_DIR, "archive"))
+FILE_NAME = "data.parquet"
+# 행 그룹을 작게 잡아 한 달 파일 안에서도 개강일 통계로 건너뛸 수 있게 합니다.
+ROW_GROUP_ROWS = 8_192
+# 훈련유형 없이 수집한 행의 파티션 이름
+NO_TYPE = "_"
+
+if pa is not None:
+    # 파일에 저장하는 열. 훈련유형(course_type)과 연월(year_month)은 디렉터리 이름에만 있습니다.
+    ARCHIVE_SCHEMA = pa.schema([
+        ("훈련기관", pa.string()),
+        ("훈련과정명", pa.string()),
+        ("과정ID", pa.string()),
+        ("회차", pa.string()),
+        ("개강일", pa.date32()),
+        ("신청인원", pa.int32()),
+        ("교육비", pa.int64()),
+        ("자격증", pa.string()),
+        ("교육비합계", pa.int64()),
+    ])
+    PARTITIONING = ds.partitioning(
+        pa.schema([("year_month", pa.string()), ("course_type", pa.string())]), flavor="hive"
+    )
+
+
+def available() -> bool:
+    """pyarrow가 설치되어 있으면 True"""
+    return pa is not None
+
+
+def _require() -> None:
+    if pa is None:
+        raise RuntimeError("HRD 아카이브를 쓰려면 pyarrow를 설치해야 합니다: pip install pyarrow")
+
+
+def _to_table(records: List[TrainingRecord]) -> "pa.Table":
+    """TrainingRecord 목록을 ARCHIVE_SCHEMA 테이블로 만듭니다(개강일 순서로 정렬)."""
+    days = pd.to_datetime(pd.Series([r.start_date for r in records], dtype=object),
+                          format="%Y-%m-%d", errors="coerce").to_numpy().astype("datetime64[D]")
+    applicants = np.fromiter((r.applicants for r in records), dtype=np.int64, count=len(records))
+    fee = np.fromiter((r.fee for r in records), dtype=np.int64, count=len(records))
+    table = pa.table({
+        "훈련기관": [r.institute for r in records],
+        "훈련과정명": [r.title for r in records],
+        "과정ID": [r.trpr_id for r in records],
+        "회차": [r.degree for r in records],
+        "개강일": pa.array(days, type=pa.date32(), mask=np.isnat(days)),
+        "신청인원": applicants.astype(np.int32),
+        "교육비": fee,
+        "자격증": [r.certificate for r in records],
+        "교육비합계": applicants * fee,
+    }, schema=ARCHIVE_SCHEMA)
+    return table.sort_by([("개강일", "ascending")])
+
+
+class Archive:
+    """(개강 연월, 훈련유형) 파티션 Parquet 보관소"""
+
+    def __init__(self, root: Optional[str] = None):
+        _require()
+        self.root = root or ARCHIVE_DIR
+        os.makedirs(self.root, exist_ok=True)
+        self.filesystem = fs.LocalFileSystem(use_mmap=True)
+
+    def _path(self, year_month: str, crse: str) -> str:
+        return os.path.join(self.root, f"year_month={year_month}", f"course_type={crse or NO_TYPE}", FILE_NAME)
+
+    def partitions(self) -> List[Tuple[str, str]]:
+        """저장된 (연월, 훈련유형) 파티션 목록 (연월 순)"""
+        found = []
+        for month_dir in sorted(os.listdir(self.root)):
+            if not month_dir.startswith("year_month="):
+                continue
+            for type_dir in sorted(os.listdir(os.path.join(self.root, month_dir))):
+                if os.path.exists(os.path.join(self.root, month_dir, type_dir, FILE_NAME)):
+                    found.append((month_dir.split("=", 1)[1], type_dir.split("=", 1)[1]))
+        return found
+
+    def put_range(self, crse: str, start: date, end: date, records: List[TrainingRecord]) -> int:
+        """start~end 구간의 수집 결과로 해당 파티션을 바꾸고 쓴 행 수를 반환합니다.
+
+        구간이 달의 일부만 덮으면 그 달 파일에서 구간 밖의 행은 그대로 두고 합칩니다.
+        파일은 임시 파일에 쓴 뒤 바꿔치기하므로 읽는 쪽은 이전 파일이나 새 파일만 봅니다.
+        """
+        by_month: Dict[str, List[TrainingRecord]] = defaultdict(list)
+        for record in records:
+            by_month[record.start_date[:7]].append(record)
+        written = 0
+        for window_start, window_end in month_windows(start, end):
+            year_month = window_start.strftime("%Y-%m")
+            window = [r for r in by_month.get(year_month, [])
+                      if window_start.isoformat() <= r.start_date <= window_end.isoformat()]
+            table = _to_table(window)
+            path = self._path(year_month, crse)
+            if os.path.exists(path):
+                kept = pq.read_table(path, memory_map=True)
+                outside = pc.or_(pc.less(kept["개강일"], pa.scalar(window_start, pa.date32())),
+                                 pc.greater(kept["개강일"], pa.scalar(window_end, pa.date32())))
+                table = pa.concat_tables([kept.filter(outside), table]).sort_by([("개강일", "ascending")])
+            if not table.num_rows:
+                if os.path.exists(path):
+                    os.remove(path)
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 점으로 시작하는 이름은 읽는 쪽(pyarrow.dataset)이 건너뜁니다.
+            temp = os.path.join(os.path.dirname(path), f".{FILE_NAME}.{os.getpid()}.tmp")
+            try:
+                pq.write_table(table, temp, compression="zstd", row_group_size=ROW_GROUP_ROWS)
+                os.replace(temp, path)
+            except Exception as e:
+                # 기존 파일은 그대로 두고, 쓰다 만 임시 파일만 지웁니다.
+                logger.error(f"아카이브 파티션 저장 실패 ({year_month}, {crse or NO_TYPE}): {e}")
+                if os.path.exists(temp):
+                    os.remove(temp)
+                raise
+            written += len(window)
+        logger.info(f"아카이브 저장: {crse or NO_TYPE} {start}~{end} {written:,}건")
+        return written
+
+    def read(self, start: Optional[date] = None, end: Optional[date] = None,
+             course_types: Optional[List[str]] = None, columns: Optional[List[str]] = None,
+             institute: str = "") -> pd.DataFrame:
+        """조건에 맞는 행을 훈련 데이터프레임(frame.SCHEMA)으로 읽습니다.
+
+        columns는 frame.COLUMNS와 "과정ID" 중에서 고르며, 고른 열만 파일에서 읽습니다.
+        institute는 훈련기관 부분 일치(대소문자 무시) 조건입니다.
+        """
+        columns = columns or COLUMNS
+        stored = [name for name in columns if name in ARCHIVE_SCHEMA.names]
+        if "훈련유형" in columns:
+            stored.append("course_type")
+        if not self.partitions():
+            return apply_schema(pd.DataFrame(columns=columns))
+
+        conditions = []
+        if start:
+            conditions += [ds.field("year_month") >= start.strftime("%Y-%m"), ds.field("개강일") >= start]
+        if end:
+            conditions += [ds.field("year_month") <= end.strftime("%Y-%m"), ds.field("개강일") <= end]
+        if course_types:
+            conditions.append(ds.field("course_type").isin([crse or NO_TYPE for crse in course_types]))
+        if institute:
+            conditions.append(pc.match_substring(ds.field("훈련기관"), institute, ignore_case=True))
+        predicate = None
+        for condition in conditions:
+            predicate = condition if predicate is None else predicate & condition
+
+        dataset = ds.dataset(self.root, format="parquet", partitioning=PARTITIONING, filesystem=self.filesystem)
+        table = dataset.to_table(columns=stored, filter=predicate)
+        df = table.to_pandas()
+        if "훈련유형" in columns:
+            # 화면과 같이 유형 코드 대신 표시 이름을 씁니다.
+            codes = df.pop("course_type").replace(NO_TYPE, "")
+            df["훈련유형"] = codes.map(lambda code: COURSE_TYPES.get(code, code))
+        if "개강일" in df.columns:
+            df["개강일"] = pd.to_datetime(df["개강일"])
+        return apply_schema(df[columns])
+
+    def clear(self) -> None:
+        """아카이브를 모두 지웁니다."""
+        shutil.rmtree(self.root, ignore_errors=True)
+        os.makedirs(self.root, exist_ok=True)
+
+
+def _parse_date(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="HRD 아카이브를 조회해 월별 합계를 출력합니다.")
+    parser.add_argument("--start", type=_parse_date, help="개강일 시작 (YYYY-MM-DD)")
+    parser.add_argument("--end", type=_parse_date, help="개강일 종료 (YYYY-MM-DD)")
+    parser.add_argument("--types", nargs="+", help="훈련유형 코드 (기본: 전체)")
+    parser.add_argument("--institute", default="", help="훈련기관 (부분 일치)")
+    args = parser.parse_args(argv)
+    if not available():
+        print("pyarrow가 설치되어 있지 않습니다.", file=sys.stderr)
+        return 2
+
+    archive = Archive()
+    # 월별 합계에 필요한 열만 읽습니다.
+    df = archive.read(args.start, args.end, args.types, ["개강일", "신청인원", "교육비합계"], args.institute)
+    if df.empty:
+        print("조건에 맞는 데이터가 없습니다.")
+        return 1
+    monthly = df.groupby(df["개강일"].dt.strftime("%Y-%m")).agg(
+        회차=("신청인원", "size"), 신청인원=("신청인원", "sum"), 교육비합계=("교육비합계", "sum"),
+    )
+    print(monthly.to_string())
+    print(f"\n{len(df):,}건, {len(archive.partitions()):,}개 파티션 중 조건에 맞는 파일만 읽었습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
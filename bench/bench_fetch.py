@@ -0,0 +1,34 @@
+"""순차 페이지 루프와 동시 수집 엔진의 처리량 비교
+
+    python -m bench.bench_fetch --rows 5000 --latency 0.05 --concurrency 8
+"""
+import argparse
+import time
+
+from bench.fake_work24 import serve
+from ratelimit import TokenBucket
+from work24 import Work24Client
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.05, help="페이지당 응답 지연(초)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=1000, help="초당 요청 수 제한")
+    args = parser.parse_args()
+
+    params = {"authKey": "bench", "srchTraStDt": "20250301", "srchTraEndDt": "20260228"}
+    with serve(args.rows, latency=args.latency) as server:
+        for label, concurrency in (("순차", 1), ("동시", args.concurrency)):
+            bucket = TokenBucket(rate=args.rate, burst=concurrency)
+            with Work24Client(base_url=server.url, concurrency=concurrency, bucket=bucket) as client:
+                started = time.perf_counter()
+                rows = client.fetch_rows(params)
+                elapsed = time.perf_counter() - started
+            print(f"{label:>4} (concurrency={concurrency:>2}): {len(rows):>6}행 {elapsed:6.2f}초 "
+                  f"({len(rows) / elapsed:,.0f}행/초) {client.metrics()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""dict 목록 → pd.DataFrame 방식과 열 단위 빌더의 최대 RSS 비교
+
+변형마다 별도 프로세스에서 합성 XML 페이지를 파싱해 DataFrame까지 만들고,
+프로세스의 최대 RSS(ru_maxrss)를 비교합니다.
+
+    python -m bench.bench_frame --rows 100000
+"""
+import argparse
+import resource
+import subprocess
+import sys
+import time
+
+from bench.fake_work24 import page_xml
+
+
+def pages(rows: int, page_size: int = 100):
+    for page in range(1, (rows + page_size - 1) // page_size + 1):
+        yield page_xml(page, page_size, rows)
+
+
+def run_dicts(rows: int) -> int:
+    import pandas as pd
+    from bench.bench_parser import parse_findtext
+
+    results = []
+    for content in pages(rows):
+        results.extend(parse_findtext(content))
+    return len(pd.DataFrame(results))
+
+
+def run_columnar(rows: int) -> int:
+    from frame import ColumnarBuilder
+    from work24_parser import iter_records
+
+    builder = ColumnarBuilder()
+    for content in pages(rows):
+        builder.extend(iter_records([content]))
+    return len(builder.to_frame())
+
+
+VARIANTS = {"dicts": run_dicts, "columnar": run_columnar}
+
+
+def child(variant: str, rows: int) -> None:
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    count = VARIANTS[variant](rows)
+    elapsed = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{variant:>8}: {count:>7}행 {elapsed:6.2f}초  최대 RSS {peak / 1024:7.1f}MB "
+          f"(임포트 후 {baseline / 1024:.1f}MB)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--variant", choices=sorted(VARIANTS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        # 비교 대상끼리 같은 조건이 되도록 pandas는 미리 임포트합니다.
+        import pandas  # noqa: F401
+        child(args.variant, args.rows)
+        return
+    for variant in VARIANTS:
+        subprocess.run([sys.executable, "-m", "bench.bench_frame", "--rows", str(args.rows),
+                        "--variant", variant], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""수집 경로 계측 오버헤드 측정
+
+같은 페이지를 세 가지 방식으로 파싱해 페이지당 시간을 비교합니다.
+
+- 계측 없음: parse_page만 호출
+- 계측: PageTimer로 청크를 감싸고 FetchStats에 더하는 실제 수집 경로
+- 행별 로그: 예전처럼 행마다, 페이지마다 INFO 로그를 남기는 방식(파일로 기록)
+
+    python -m bench.bench_instrument --repeat 200
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+from typing import Callable
+
+from bench.fake_work24 import page_xml
+from instrument import FetchStats, PageTimer, redact, sampled
+from work24_parser import parse_page
+
+CHUNK = 64 * 1024
+PARAMS = {"authKey": "secret", "srchTraStDt": "20250101", "srchTraEndDt": "20251231", "crseTracseSe": "C0041T"}
+
+logger = logging.getLogger("bench.instrument")
+
+
+def chunks(content: bytes):
+    return (content[i:i + CHUNK] for i in range(0, len(content), CHUNK))
+
+
+def plain(content: bytes, stats: FetchStats) -> int:
+    return len(parse_page(chunks(content))[1])
+
+
+def instrumented(content: bytes, stats: FetchStats) -> int:
+    timer = PageTimer()
+    timer.lap("request")
+    _, records = parse_page(timer.count_chunks(chunks(content)))
+    timer.lap("parse")
+    stats.add_page(timer, len(records))
+    if sampled(logger):
+        logger.debug(f"페이지 {redact(PARAMS)}: {len(records)}행, {timer.bytes:,}B")
+    return len(records)
+
+
+def per_row_logging(content: bytes, stats: FetchStats) -> int:
+    logger.info(f"API 요청 파라미터: {PARAMS}")
+    _, records = parse_page(chunks(content))
+    for record in records:
+        logger.info(f"데이터 추가: {record}")
+    return len(records)
+
+
+def measure(parse: Callable[[bytes, FetchStats], int], content: bytes, repeat: int) -> float:
+    stats = FetchStats()
+    parse(content, stats)  # 준비 운동
+    started = time.perf_counter()
+    for _ in range(repeat):
+        parse(content, stats)
+    return (time.perf_counter() - started) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=100, help="페이지당 행 수 (API 페이지 크기)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        handler = logging.FileHandler(os.path.join(tmp, "bench.log"), encoding="utf-8")
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        try:
+            content = page_xml(1, args.rows, args.rows)
+            baseline = measure(plain, content, args.repeat)
+            for label, parse in (("계측 없음", plain), ("계측", instrumented), ("행별 로그", per_row_logging)):
+                elapsed = baseline if parse is plain else measure(parse, content, args.repeat)
+                overhead = (elapsed / baseline - 1) * 100
+                print(f"{args.rows}행 페이지 {label:>6}: {elapsed * 1000:7.3f}ms/페이지  ({overhead:+6.1f}%)")
+        finally:
+            logger.removeHandler(handler)
+            handler.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""기존 ET.fromstring + findtext 방식과 스트리밍 파서 비교
+
+    python -m bench.bench_parser --repeat 20
+"""
+import argparse
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from typing import Callable, List
+
+from bench.fake_work24 import page_xml
+from work24_parser import parse_page
+
+
+def parse_findtext(content: bytes) -> List[dict]:
+    """app_v2.py의 기존 파싱 방식"""
+    root = ET.fromstring(content)
+    results = []
+    for row in root.find("srchList").findall("scn_list"):
+        result = {
+            "훈련기관": row.findtext("subTitle", "").strip(),
+            "훈련과정명": row.findtext("title", "").strip(),
+            "회차": row.findtext("trprDegr", "").strip(),
+            "개강일": row.findtext("traStartDate", "").strip(),
+            "신청인원": int(row.findtext("regCourseMan", "0")),
+            "교육비": int(row.findtext("realMan", "0")),
+            "자격증": row.findtext("certificate", "").strip(),
+        }
+        result["교육비합계"] = result["신청인원"] * result["교육비"]
+        results.append(result)
+    return results
+
+
+def parse_streaming(content: bytes) -> list:
+    # 실제 수집 경로처럼 64KB 청크로 나눠 넣습니다.
+    chunk = 64 * 1024
+    return parse_page(content[i:i + chunk] for i in range(0, len(content), chunk))[1]
+
+
+def measure(parse: Callable[[bytes], list], content: bytes, repeat: int) -> tuple:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        rows = parse(content)
+    elapsed = (time.perf_counter() - started) / repeat
+    tracemalloc.start()
+    parse(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(rows), elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    for rows in (100, 10_000):
+        content = page_xml(1, rows, rows)
+        for label, parse in (("findtext", parse_findtext), ("streaming", parse_streaming)):
+            count, elapsed, peak = measure(parse, content, args.repeat)
+            print(f"{rows:>6}행 {label:>9}: {elapsed * 1000:8.2f}ms  peak {peak / 1024:8.0f}KB  ({count}행)")
+
+
+if __name__ == "__main__":
+    main()
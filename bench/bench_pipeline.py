@@ -0,0 +1,231 @@
+"""app_v2.py 전체 파이프라인 오프라인 벤치마크
+
+로컬 대역 서버(bench/fake_work24.py)를 상대로 대시보드와 같은 순서로
+수집(파티션 저장소 동기화, "전체" 유형별 동시 수집) → 데이터프레임 생성 →
+집계 큐브 → 그래프 생성 → CSV/Excel 내보내기를 실행하고, 단계별 시간과
+최대 RSS를 JSON 파일로 남깁니다. 크기마다 별도 프로세스에서 실행하므로
+최대 RSS가 이전 크기의 영향을 받지 않습니다.
+
+    python -m bench.bench_pipeline                          # 1k/10k/100k행
+    python -m bench.bench_pipeline --rows 10000 --latency 0.02 --error-rate 0.01
+    python -m bench.bench_pipeline --compare bench/results/pipeline-abc1234.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+# 합성 데이터의 개강일 전체 구간 (fake_work24.SYNTHETIC_START부터 365일)
+PARAMS = {"authKey": "bench", "srchTraStDt": "20250301", "srchTraEndDt": "20260228"}
+
+
+def peak_rss_mb() -> float:
+    # 리눅스의 ru_maxrss는 KB, macOS는 바이트 단위입니다.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_pipeline(rows: int, latency: float, error_rate: float, rate: float) -> Dict:
+    """한 프로세스에서 rows행 파이프라인을 한 번 실행하고 단계별 결과를 반환합니다."""
+    import archive
+    from aggregate import AggregateCube
+    from bench.fake_work24 import serve
+    from diff import CHANGED, net_changes
+    from charts import GRANULARITIES, TYPE_LAYOUTS, build_figures, cached_figures
+    from export import write_csv, write_xlsx
+    from frame import build_frame, frame_hash
+    from instrument import FetchStats
+    from partition_store import PartitionStore, parse_day, sync_query
+    from ratelimit import TokenBucket
+    from work24 import Work24Client
+    from work24_parser import COURSE_TYPES
+
+    stages: Dict[str, Dict[str, float]] = {}
+
+    def stage(name: str, started: float) -> None:
+        stages[name] = {"seconds": round(time.perf_counter() - started, 4), "peak_rss_mb": round(peak_rss_mb(), 1)}
+
+    stats = FetchStats("벤치마크")
+    with serve(rows, latency=latency, error_rate=error_rate) as server, tempfile.TemporaryDirectory() as tmp:
+        bucket = TokenBucket(rate=rate, burst=max(1, int(rate)))
+        with Work24Client(base_url=server.url, bucket=bucket) as client:
+            store = PartitionStore(os.path.join(tmp, "partitions.sqlite3"))
+            # 대시보드의 "전체" 선택과 같이 유형별로 동시에 수집합니다.
+            params = {**PARAMS, "crseTracseSe": ",".join(COURSE_TYPES)}
+            started = time.perf_counter()
+            records = sync_query(store, params, client, stats=stats)
+            stage("fetch", started)
+
+            started = time.perf_counter()
+            warm = sync_query(store, params, client)
+            stage("fetch_from_store", started)
+            assert len(warm) == len(records)
+
+            # 다시 수집한 한 달에서 회차 둘의 개강일을 앞/뒤로 옮긴 변동 기록과 합치기
+            crse = next(iter(COURSE_TYPES))
+            start = parse_day(PARAMS["srchTraStDt"])
+            end = start + timedelta(days=30)
+            month = store.load(crse, start, end)
+            mid = [row for row in month if "2025-03-10" <= row.start_date <= "2025-03-20"]
+            moved = {
+                (mid[0].trpr_id, mid[0].degree): -5,  # 앞당김
+                (mid[-1].trpr_id, mid[-1].degree): 5,  # 미룸
+            }
+            refreshed = [
+                row._replace(start_date=(date.fromisoformat(row.start_date) + timedelta(days=moved[(row.trpr_id, row.degree)]))
+                             .isoformat(), applicants=row.applicants + 1)
+                if (row.trpr_id, row.degree) in moved else row
+                for row in month
+            ]
+            started = time.perf_counter()
+            store.put_range(crse, start, end, refreshed)
+            changes = net_changes(store.changes(crse, start, end, 0))
+            stage("changes", started)
+            assert sorted((c.trpr_id, c.degree, c.kind, c.delta) for c in changes) == sorted(
+                (trpr_id, degree, CHANGED, 1) for trpr_id, degree in moved
+            ), changes
+
+        started = time.perf_counter()
+        df = build_frame(records)
+        data_hash = frame_hash(df)
+        stage("build_frame", started)
+
+        if archive.available():
+            # HRD 아카이브(Parquet) 쓰기와, 전체/한 달·한 유형만 읽기
+            history = archive.Archive(os.path.join(tmp, "archive"))
+            start, end = parse_day(PARAMS["srchTraStDt"]), parse_day(PARAMS["srchTraEndDt"])
+            started = time.perf_counter()
+            for crse in COURSE_TYPES:
+                history.put_range(crse, start, end, [row for row in records if row.course_type == crse])
+            stage("archive_write", started)
+            started = time.perf_counter()
+            assert len(history.read(start, end)) == len(df)
+            stage("archive_read", started)
+            started = time.perf_counter()
+            history.read(start, start + timedelta(days=30), [next(iter(COURSE_TYPES))], ["개강일", "신청인원"])
+            stage("archive_read_month", started)
+        del records, warm
+
+        started = time.perf_counter()
+        cube = AggregateCube.from_frame(df)
+        cube.summary()
+        stage("aggregate", started)
+
+        for layout in TYPE_LAYOUTS:
+            for granularity in GRANULARITIES:
+                started = time.perf_counter()
+                figures = build_figures(cube, layout, granularity=granularity)
+                for figure in figures:
+                    figure.to_json()  # st.plotly_chart가 하는 직렬화까지 포함
+                stage(f"figures:{layout}:{granularity}", started)
+        # 같은 데이터셋/옵션으로 다시 그릴 때(그래프 JSON 캐시 적중)
+        cached_figures(data_hash, cube)
+        started = time.perf_counter()
+        for figure in cached_figures(data_hash, cube):
+            figure.to_json()
+        stage("figures:cached", started)
+
+        started = time.perf_counter()
+        csv_bytes = len(write_csv(df))
+        stage("export_csv", started)
+        started = time.perf_counter()
+        xlsx_bytes = len(write_xlsx({"Sheet1": df}))
+        stage("export_xlsx", started)
+        requests = server.request_count
+        bytes_sent = server.bytes_sent
+
+    fetch = stats.summary()
+    return {
+        "rows": len(df),
+        "requests": requests,
+        "bytes_downloaded": bytes_sent,
+        "failed_pages": fetch["failed_pages"],
+        "retries": fetch["retries"],
+        "fetch_spans": {key: value for key, value in fetch.items() if key.endswith("_seconds")},
+        "stages": stages,
+        "csv_bytes": csv_bytes,
+        "xlsx_bytes": xlsx_bytes,
+        "wall_seconds": round(sum(stage["seconds"] for stage in stages.values()), 4),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict, baseline_path: str) -> None:
+    """이전 결과 파일과 크기별 전체 시간/최대 RSS를 비교해 출력합니다."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\n기준: {baseline.get('commit')} ({baseline_path})")
+    for size, result in current["results"].items():
+        before = baseline["results"].get(size)
+        if before is None:
+            continue
+        for key in ("wall_seconds", "peak_rss_mb"):
+            change = (result[key] / before[key] - 1) * 100 if before[key] else 0.0
+            print(f"{int(size):>7,}행 {key:>12}: {before[key]:>9} → {result[key]:>9} ({change:+.1f}%)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--latency", type=float, default=0.0, help="대역 서버 페이지당 지연(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="대역 서버 503 응답 비율")
+    parser.add_argument("--rate", type=float, default=1e6, help="초당 요청 수 제한 (기본: 사실상 무제한)")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: bench/results/pipeline-<commit>.json)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_pipeline(args.child, args.latency, args.error_rate, args.rate)))
+        return
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "latency": args.latency,
+        "error_rate": args.error_rate,
+        "results": {},
+    }
+    for rows in args.rows:
+        output = subprocess.run(
+            [sys.executable, "-m", "bench.bench_pipeline", "--child", str(rows),
+             "--latency", str(args.latency), "--error-rate", str(args.error_rate), "--rate", str(args.rate)],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        report["results"][str(rows)] = result
+        stages = "  ".join(f"{name} {stage['seconds']:.2f}s" for name, stage in result["stages"].items())
+        print(f"{rows:>7,}행: 전체 {result['wall_seconds']:.2f}s, 최대 RSS {result['peak_rss_mb']:.0f}MB | {stages}")
+
+    path = args.output or os.path.join(RESULTS_DIR, f"pipeline-{commit or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"결과를 {path}에 저장했습니다.")
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""고용24 API 로컬 대역 서버
+
+실제 인증키와 네트워크 없이 수집 엔진을 측정하기 위한 HTTP 서버입니다.
+요청된 pageNum/pageSize에 맞춰 합성 scn_list 행을 XML로 돌려주며,
+페이지당 지연 시간과 오류 비율을 설정할 수 있습니다.
+
+합성 행 i는 개강일 SYNTHETIC_START + (i % 365)일, 훈련유형 COURSE_TYPES[i % 5]를 가지며,
+요청의 srchTraStDt/srchTraEndDt/crseTracseSe에 맞는 행만 개강일 순서로 돌려줍니다.
+fixtures를 주면 합성 행 대신 기록해 둔 응답 XML을 pageNum 순서대로 재생합니다.
+
+    python -m bench.fake_work24 serve --rows 10000          # 대시보드를 대역 서버로 띄울 때
+    python -m bench.fake_work24 record --out fixtures/ --start 20250301 --end 20250331
+"""
+import argparse
+import glob
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+INSTITUTES = ["알파코", "가나다아카데미", "한빛교육원", "미래인재개발원", "코드스쿨", "데이터캠퍼스"]
+COURSE_TYPES = ["C0041T", "C0041B", "C0041N", "C0041A", "C0041H"]
+SYNTHETIC_START = date(2025, 3, 1)
+SYNTHETIC_DAYS = 365
+
+
+def synthetic_row(index: int, start: date = SYNTHETIC_START) -> str:
+    """index번째 합성 scn_list 행의 XML 조각을 만듭니다."""
+    institute = INSTITUTES[index % len(INSTITUTES)]
+    course_no = index // 7
+    start_date = start + timedelta(days=index % SYNTHETIC_DAYS)
+    return (
+        "<scn_list>"
+        f"<subTitle>{escape(institute)}</subTitle>"
+        f"<title>{escape(f'합성 훈련과정 {course_no}')}</title>"
+        f"<trprId>AIG{course_no:08d}</trprId>"
+        f"<trprDegr>{index % 7 + 1}</trprDegr>"
+        f"<traStartDate>{start_date:%Y-%m-%d}</traStartDate>"
+        f"<traEndDate>{start_date + timedelta(days=30):%Y-%m-%d}</traEndDate>"
+        f"<regCourseMan>{index % 40}</regCourseMan>"
+        f"<realMan>{(index % 50 + 1) * 10000}</realMan>"
+        f"<certificate>{'정보처리기사' if index % 3 == 0 else ''}</certificate>"
+        "</scn_list>"
+    )
+
+
+def matching_rows(total: int, start: Optional[date], end: Optional[date], crse: str) -> List[int]:
+    """조회 조건에 맞는 합성 행 번호를 개강일 순서로 반환합니다."""
+    first = 0 if start is None else max(0, (start - SYNTHETIC_START).days)
+    last = SYNTHETIC_DAYS - 1 if end is None else min(SYNTHETIC_DAYS - 1, (end - SYNTHETIC_START).days)
+    types = {code for code in crse.split(",") if code}
+    return [
+        index
+        for offset in range(first, last + 1)
+        for index in range(offset, total, SYNTHETIC_DAYS)
+        if not types or COURSE_TYPES[index % len(COURSE_TYPES)] in types
+    ]
+
+
+def page_xml(page: int, page_size: int, total: int, rows: Optional[Sequence[int]] = None) -> bytes:
+    """한 페이지 분량의 응답 XML을 만듭니다. rows를 주면 그 행 번호 목록에서 페이지를 자릅니다."""
+    first = (page - 1) * page_size
+    if rows is None:
+        rows = range(total)
+    else:
+        total = len(rows)
+    rows = "".join(synthetic_row(i) for i in rows[first:first + page_size])
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f"<HRDNet><scn_cnt>{total}</scn_cnt><pageNum>{page}</pageNum>"
+        f"<pageSize>{page_size}</pageSize><srchList>{rows}</srchList></HRDNet>"
+    ).encode("utf-8")
+
+
+class FakeWork24Server(ThreadingHTTPServer):
+    """설정값(전체 건수, 지연, 오류 비율)을 가진 대역 서버"""
+
+    daemon_threads = True
+
+    def __init__(self, total_rows: int, latency: float = 0.0, error_rate: float = 0.0,
+                 seed: Optional[int] = 0, fixtures: Optional[List[bytes]] = None, port: int = 0):
+        super().__init__(("127.0.0.1", port), FakeWork24Handler)
+        self.total_rows = total_rows
+        self.latency = latency
+        self.error_rate = error_rate
+        self.fixtures = fixtures
+        self.random = random.Random(seed)
+        self.request_count = 0
+        self.bytes_sent = 0
+        self.lock = threading.Lock()
+        self._matches: Dict[Tuple[str, str, str], List[int]] = {}
+
+    def rows_for(self, start: str, end: str, crse: str) -> List[int]:
+        """조회 조건별 행 번호 목록 (같은 조건의 페이지 요청끼리 공유)"""
+        key = (start, end, crse)
+        with self.lock:
+            rows = self._matches.get(key)
+        if rows is None:
+            rows = matching_rows(
+                self.total_rows,
+                datetime.strptime(start, "%Y%m%d").date() if start else None,
+                datetime.strptime(end, "%Y%m%d").date() if end else None,
+                crse,
+            )
+            with self.lock:
+                self._matches[key] = rows
+        return rows
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/cm/openApi/call/hr/callOpenApiSvcInfo311L01.do"
+
+
+class FakeWork24Handler(BaseHTTPRequestHandler):
+    server: FakeWork24Server
+
+    def do_GET(self) -> None:
+        query = parse_qs(urlparse(self.path).query)
+        page = int(query.get("pageNum", ["1"])[0])
+        page_size = int(query.get("pageSize", ["100"])[0])
+        with self.server.lock:
+            self.server.request_count += 1
+            fail = self.server.random.random() < self.server.error_rate
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if fail:
+            self.send_error(503, "injected error")
+            return
+        if self.server.fixtures is not None:
+            # 기록한 응답은 조건과 무관하게 pageNum 순서대로 재생합니다(범위 밖은 빈 목록).
+            fixtures = self.server.fixtures
+            body = fixtures[page - 1] if page <= len(fixtures) else page_xml(page, page_size, 0)
+        else:
+            rows = self.server.rows_for(
+                query.get("srchTraStDt", [""])[0], query.get("srchTraEndDt", [""])[0],
+                query.get("crseTracseSe", [""])[0],
+            )
+            body = page_xml(page, page_size, len(rows), rows)
+        with self.server.lock:
+            self.server.bytes_sent += len(body)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/xml; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def load_fixtures(directory: str) -> List[bytes]:
+    """record로 저장한 page_0001.xml … 파일을 페이지 순서대로 읽습니다."""
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(directory, "page_*.xml"))):
+        with open(path, "rb") as f:
+            fixtures.append(f.read())
+    return fixtures
+
+
+@contextmanager
+def serve(total_rows: int, latency: float = 0.0, error_rate: float = 0.0,
+          fixtures: Optional[List[bytes]] = None) -> Iterator[FakeWork24Server]:
+    """백그라운드 스레드에서 대역 서버를 띄우고 종료 시 정리합니다."""
+    server = FakeWork24Server(total_rows, latency, error_rate, fixtures=fixtures)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def record(out: str, start: str, end: str, crse: str) -> int:
+    """실제 API 응답을 페이지별 XML 파일로 저장합니다(AUTH_KEY 필요). 저장한 페이지 수를 반환합니다."""
+    import requests
+    from dotenv import load_dotenv
+
+    from work24 import BASE_URL, build_request_params, page_count
+    from work24_parser import parse_page
+
+    load_dotenv()
+    params = {"authKey": os.getenv("AUTH_KEY", ""), "srchTraStDt": start, "srchTraEndDt": end, "crseTracseSe": crse}
+    os.makedirs(out, exist_ok=True)
+    with requests.Session() as session:
+        page, last_page = 1, 1
+        while page <= last_page:
+            response = session.get(BASE_URL, params=build_request_params(params, page), timeout=30)
+            response.raise_for_status()
+            if page == 1:
+                total, _ = parse_page(response.content)
+                last_page = page_count(total or 0)
+            with open(os.path.join(out, f"page_{page:04d}.xml"), "wb") as f:
+                f.write(response.content)
+            page += 1
+    return last_page
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="고용24 API 로컬 대역 서버")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="대역 서버를 띄웁니다 (WORK24_BASE_URL로 앱을 연결)")
+    serve_parser.add_argument("--rows", type=int, default=10_000)
+    serve_parser.add_argument("--latency", type=float, default=0.0)
+    serve_parser.add_argument("--error-rate", type=float, default=0.0)
+    serve_parser.add_argument("--fixtures", help="record로 저장한 디렉터리 (합성 행 대신 재생)")
+    serve_parser.add_argument("--port", type=int, default=8024)
+    record_parser = commands.add_parser("record", help="실제 API 응답을 fixture로 저장합니다")
+    record_parser.add_argument("--out", required=True)
+    record_parser.add_argument("--start", required=True, help="YYYYMMDD")
+    record_parser.add_argument("--end", required=True, help="YYYYMMDD")
+    record_parser.add_argument("--type", default="", help="crseTracseSe")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        print(f"{record(args.out, args.start, args.end, args.type)}페이지를 {args.out}에 저장했습니다.")
+        return
+    fixtures = load_fixtures(args.fixtures) if args.fixtures else None
+    server = FakeWork24Server(args.rows, args.latency, args.error_rate, fixtures=fixtures, port=args.port)
+    print(f"WORK24_BASE_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""조회 결과 영속 캐시
+
+Streamlit 워커가 재시작되거나 여러 프로세스로 떠 있어도 같은 조회 기간을
+다시 고용24에서 받아오지 않도록, 조회 조건별 결과를 SQLite 파일에 보관합니다.
+항목 수/용량 상한을 넘으면 가장 오래 사용되지 않은 항목부터 지웁니다(LRU).
+WAL 모드를 사용하므로 여러 프로세스가 동시에 읽고 쓸 수 있습니다.
+
+TTL은 두 단계입니다. ttl(soft)이 지난 항목은 오래된(stale) 결과로 그대로 제공하면서
+백그라운드에서 다시 받아오고(stale-while-revalidate, revalidate.py), hard_ttl이 지난
+항목은 더 이상 제공하지 않습니다. 항목마다 조회 횟수를 세어 자주 찾는 조건은
+만료되기 전에 미리 갱신할 수 있게 합니다.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.getenv("HRD_CACHE_DIR", ".hrd_cache")
+DEFAULT_TTL = 3600  # 기존 TTLCache와 동일한 1시간
+DEFAULT_HARD_TTL = 6 * 3600  # 이보다 오래된 결과는 기다리더라도 새로 받습니다.
+DEFAULT_MAX_ENTRIES = 100
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# 조회 결과와 무관한 파라미터는 캐시 키에서 제외합니다(인증키 포함).
+IGNORED_PARAMS = {"authKey", "pageNum"}
+
+# lookup() 결과 상태
+HIT, STALE, MISS = "hit", "stale", "miss"
+SQLITE_TIMEOUT = 30  # SQLite 잠금 대기(초)
+
+
+def normalize_params(params: Dict[str, str]) -> str:
+    """조회 조건을 순서와 인증키에 무관한 문자열로 정규화합니다."""
+    normalized = {k: str(v) for k, v in params.items() if k not in IGNORED_PARAMS}
+    return json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+
+
+def connect(path: str, create: bool = False) -> sqlite3.Connection:
+    """SQLite 저장소(결과 캐시, 파티션 저장소, 공유 토큰 버킷)가 함께 쓰는 연결 함수
+
+    자동 커밋 모드로 열고 잠금은 최대 SQLITE_TIMEOUT초 기다립니다. 연결은 호출마다 새로 열어
+    스레드/프로세스 간에 공유하지 않습니다. create이면 상위 디렉터리를 만들고 WAL 모드로 바꿉니다.
+    """
+    if create:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=SQLITE_TIMEOUT, isolation_level=None)
+    conn.execute(f"PRAGMA busy_timeout={SQLITE_TIMEOUT * 1000}")
+    if create:
+        conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+class ResultCache:
+    """조회 조건 → 결과 목록을 저장하는 SQLite 기반 LRU/TTL 캐시
+
+    counters에는 이 인스턴스의 lookup() 결과(hit/stale/miss) 횟수를 모읍니다.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = DEFAULT_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES,
+                 hard_ttl: float = DEFAULT_HARD_TTL):
+        self.path = path or os.path.join(CACHE_DIR, "results.sqlite3")
+        self.ttl = ttl
+        self.hard_ttl = max(hard_ttl, ttl)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.counters: Dict[str, int] = dict.fromkeys((HIT, STALE, MISS), 0)
+        self._lock = threading.Lock()
+        conn = connect(self.path, create=True)
+        try:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS results (
+                    key TEXT PRIMARY KEY,
+                    params TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                )"""
+            )
+            columns = {name for _, name, *_ in conn.execute("PRAGMA table_info(results)")}
+            if "hits" not in columns:
+                # 조회 횟수 열이 생기기 전에 만든 캐시 파일
+                conn.execute("ALTER TABLE results ADD COLUMN hits INTEGER NOT NULL DEFAULT 0")
+            conn.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results(accessed_at)")
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _key(params: Dict[str, str]) -> str:
+        return hashlib.sha256(normalize_params(params).encode("utf-8")).hexdigest()
+
+    def _read(self, params: Dict[str, str], count: bool) -> Tuple[Optional[Any], str]:
+        key = self._key(params)
+        now = time.time()
+        conn = connect(self.path)
+        try:
+            row = conn.execute(
+                "SELECT value, created_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None, MISS
+            value, created_at = row
+            if now - created_at > self.hard_ttl:
+                conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                return None, MISS
+            conn.execute(
+                "UPDATE results SET accessed_at = ?, hits = hits + ? WHERE key = ?", (now, int(count), key)
+            )
+        finally:
+            conn.close()
+        return json.loads(zlib.decompress(value)), HIT if now - created_at <= self.ttl else STALE
+
+    def lookup(self, params: Dict[str, str]) -> Tuple[Optional[Any], str]:
+        """(결과, 상태)를 반환합니다. 상태는 HIT(ttl 안), STALE(hard_ttl 안), MISS 중 하나이며
+        MISS일 때 결과는 None입니다. 조회 횟수와 counters에 반영됩니다."""
+        value, state = self._read(params, count=True)
+        with self._lock:
+            self.counters[state] += 1
+        return value, state
+
+    def get(self, params: Dict[str, str]) -> Optional[Any]:
+        """TTL 안의 결과가 있으면 반환하고, 없으면 None을 반환합니다(조회 횟수에는 넣지 않음)."""
+        value, state = self._read(params, count=False)
+        return value if state == HIT else None
+
+    def set(self, params: Dict[str, str], value: Any) -> None:
+        """결과를 저장하고 상한을 넘는 항목을 LRU 순서로 정리합니다."""
+        key = self._key(params)
+        blob = zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        now = time.time()
+        conn = connect(self.path)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # 다시 받아 덮어써도 조회 횟수는 유지합니다.
+            conn.execute(
+                """INSERT INTO results (key, params, value, size, created_at, accessed_at)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(key) DO UPDATE SET
+                       value = excluded.value, size = excluded.size, created_at = excluded.created_at""",
+                (key, normalize_params(params), blob, len(blob), now, now),
+            )
+            conn.execute("DELETE FROM results WHERE created_at < ?", (now - self.hard_ttl,))
+            self._evict(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        for key, size in conn.execute(
+            "SELECT key, size FROM results ORDER BY accessed_at ASC"
+        ).fetchall():
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            count -= 1
+            total -= size
+            logger.info(f"캐시 항목 정리: {key[:12]} ({size:,} bytes)")
+
+    def hottest(self, n: int) -> List[Tuple[Dict[str, str], float]]:
+        """hard_ttl 안에 쓰인 항목 중 조회 횟수가 많은 n개의 (조회 조건, 만든 시각)
+
+        조회 조건에는 인증키가 없으므로(IGNORED_PARAMS) 다시 받을 때 붙여야 합니다.
+        """
+        cutoff = time.time() - self.hard_ttl
+        conn = connect(self.path)
+        try:
+            rows = conn.execute(
+                "SELECT params, created_at FROM results WHERE created_at >= ? AND accessed_at >= ? "
+                "ORDER BY hits DESC, accessed_at DESC LIMIT ?",
+                (cutoff, cutoff, n),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [(json.loads(params), created_at) for params, created_at in rows]
+
+    def clear(self) -> None:
+        """모든 캐시 항목을 삭제합니다."""
+        conn = connect(self.path)
+        try:
+            conn.execute("DELETE FROM results")
+        finally:
+            conn.close()
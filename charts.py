@@ -0,0 +1,275 @@
+"""대시보드 그래프
+
+app_v2.py의 그래프 생성 코드를 Streamlit 없이 불러올 수 있도록 분리한 모듈입니다.
+집계 큐브(AggregateCube)만 받아 Plotly Figure를 만들므로 벤치마크에서도 그대로 씁니다.
+
+그래프는 종류별(상위 기관 신청인원, 상위 기관 교육비, 신청인원 추이)로 따로 만들고,
+직렬화한 JSON을 (데이터셋 해시, 그래프 종류, 옵션) 단위로 프로세스 안에서 재사용합니다.
+강조 규칙만 바꾸면 막대 그래프만, 추이 단위만 바꾸면 추이 그래프만 다시 만듭니다.
+막대 라벨은 파이썬에서 문자열을 만들지 않고 texttemplate으로 브라우저가 포맷합니다.
+
+일 단위 추이는 점이 MAX_POINTS개를 넘으면 LTTB(Largest-Triangle-Three-Buckets)로
+모양(봉우리와 골)을 유지하면서 점 수를 줄여 그립니다.
+"""
+import json
+import os
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from aggregate import AggregateCube
+from instrument import Timings
+from lru import LRUCache
+from search import DEFAULT_HIGHLIGHT, HighlightRules
+
+# 훈련유형이 여러 개일 때 그래프 표시 방식
+TYPE_LAYOUTS = ["누적", "유형별 분할"]
+# 신청인원 추이 단위
+GRANULARITIES = ["월", "일"]
+CHART_KINDS = ["applicants", "fees", "trend"]
+TYPE_COLORS = ['#555555', '#999999', '#7a9cc6', '#c9a66b', '#9bbf85']
+# 밝은 회색~진한 회색 그라데이션
+GRAY_PALETTE = np.array([
+    '#eeeeee', '#dddddd', '#cccccc', '#bbbbbb', '#aaaaaa',
+    '#999999', '#888888', '#777777', '#666666', '#555555',
+])
+HIGHLIGHT_COLOR = '#FF6F61'  # 강조 기관(기본: 알파코) 색상
+# 추이 그래프 한 계열의 최대 점 수 (넘으면 LTTB로 줄임)
+MAX_POINTS = int(os.getenv("HRD_CHART_MAX_POINTS", "1000"))
+MAX_CACHED_FIGURES = 64
+Highlight = Callable[[str], bool]
+
+
+def format_krw_uk(value):
+    """숫자를 억원 단위(소수점 1자리)로 변환해주는 함수"""
+    return f"{value/1e8:.1f}억"
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """LTTB로 고른 점의 위치(오름차순). 점이 threshold개 이하면 모두 반환합니다.
+
+    첫 점과 끝 점은 항상 남기고, 나머지를 threshold - 2개 구간으로 나눠 구간마다
+    직전에 고른 점, 다음 구간 평균과 만드는 삼각형이 가장 큰 점 하나를 고릅니다.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    every = (n - 2) / (threshold - 2)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        indices[i + 1] = a
+    return indices
+
+
+def _day_numbers(days: pd.Series) -> np.ndarray:
+    return days.to_numpy().astype("datetime64[D]").astype(np.int64).astype(float)
+
+
+def trend_frame(cube: AggregateCube, granularity: str = GRANULARITIES[0],
+                by_type: bool = False, max_points: int = MAX_POINTS) -> Tuple[pd.DataFrame, str, int]:
+    """추이 그래프 데이터, x축 열 이름, 줄이기 전 x축 지점 수를 반환합니다.
+
+    유형별 일 단위 데이터는 유형마다 같은 날짜를 남겨야 누적 면적이 어긋나지 않으므로
+    날짜 × 유형 표로 펼쳐 합계 계열에서 날짜를 고른 뒤 다시 긴 형식으로 되돌립니다.
+    """
+    if granularity != GRANULARITIES[1]:
+        data = cube.monthly("신청인원", by_type=by_type)
+        return data, "개강월", data["개강월"].nunique()
+    data = cube.daily("신청인원", by_type=by_type)
+    if not by_type:
+        keep = lttb_indices(_day_numbers(data["개강일"]), data["신청인원"].to_numpy(), max_points)
+        return data.iloc[keep], "개강일", len(data)
+    wide = data.pivot_table(index="개강일", columns="훈련유형", values="신청인원",
+                            aggfunc="sum", fill_value=0, observed=True)
+    keep = lttb_indices(_day_numbers(wide.index.to_series()), wide.sum(axis=1).to_numpy(), max_points)
+    narrowed = wide.iloc[keep].reset_index().melt(id_vars="개강일", var_name="훈련유형", value_name="신청인원")
+    return narrowed, "개강일", len(wide)
+
+
+def _trend_title(granularity: str, points: int, shown: int) -> str:
+    title = f"{granularity}별 신청인원 추이"
+    if shown < points:
+        title += f" (전체 {points:,}개 중 {shown:,}개 지점 표시)"
+    return title
+
+
+def _bar_layout(fig: go.Figure, title: str, yaxis_title: str, tickformat: str, **layout) -> None:
+    fig.update_layout(
+        title=title,
+        font=dict(size=16),  # 폰트 크기 증가
+        title_font=dict(size=18),
+        plot_bgcolor='#fafafa',
+        paper_bgcolor='#fafafa',
+        yaxis_title=yaxis_title,
+        xaxis_title="훈련기관",
+        height=500,  # 그래프 높이 증가
+        yaxis_tickformat=tickformat,
+        uniformtext_minsize=10,
+        uniformtext_mode='hide',
+        **layout,
+    )
+
+
+def _top_bar(cube: AggregateCube, measure: str, highlight: Highlight) -> go.Figure:
+    """상위 20개 기관 막대 그래프 (유형 하나일 때). 교육비는 억원 단위로 그립니다."""
+    top = cube.top_institutes(measure, 20)
+    institutes = top.index.astype(str).to_numpy()
+    is_fee = measure == "교육비합계"
+    flags = np.fromiter((highlight(name) for name in institutes), dtype=bool, count=len(institutes))
+    colors = np.where(flags, HIGHLIGHT_COLOR, GRAY_PALETTE[np.arange(len(institutes)) % len(GRAY_PALETTE)])
+    fig = go.Figure(data=[
+        go.Bar(
+            x=institutes,
+            y=top.to_numpy() / 1e8 if is_fee else top.to_numpy(),
+            marker_color=colors,
+            texttemplate='%{y:.1f}억' if is_fee else '%{y:,d}',
+            textposition='outside',
+        )
+    ])
+    if is_fee:
+        _bar_layout(fig, "상위 20개 훈련기관 교육비 합계", "교육비 합계(억원)", ".1f",
+                    margin=dict(t=600, b=240, l=180, r=180))  # 내부 여백을 3배로 증가
+    else:
+        _bar_layout(fig, "상위 20개 훈련기관 신청인원", "신청인원", ",d", margin=dict(t=80, b=60))
+    return fig
+
+
+def _trend_line(cube: AggregateCube, granularity: str) -> go.Figure:
+    data, x, points = trend_frame(cube, granularity)
+    daily = x == "개강일"
+    # 일 단위는 점이 많으므로 표식 없이 선만 그립니다.
+    fig = px.line(data, x=x, y="신청인원", title=_trend_title(granularity, points, len(data)),
+                  labels={"신청인원": "신청인원", x: x}, markers=not daily)
+    fig.update_traces(line_color='#888888')
+    fig.update_layout(
+        font=dict(size=16),  # 폰트 크기 증가
+        title_font=dict(size=18),
+        plot_bgcolor='#fafafa',
+        paper_bgcolor='#fafafa',
+        yaxis_tickformat=",d",
+        height=500  # 그래프 높이 증가
+    )
+    return fig
+
+
+def _type_figure(cube: AggregateCube, kind: str, type_layout: str, granularity: str,
+                 highlight: Highlight) -> go.Figure:
+    """훈련유형이 여러 개일 때 유형별로 쌓거나(누적) 유형마다 나눠(유형별 분할) 그립니다."""
+    facet = type_layout == TYPE_LAYOUTS[1]
+    common = dict(
+        color="훈련유형",
+        color_discrete_sequence=TYPE_COLORS,
+        category_orders={"훈련유형": cube.types},
+        **(dict(facet_row="훈련유형") if facet else {}),
+    )
+    data = None
+    if kind == "applicants":
+        data = cube.top_institutes_by_type("신청인원", 20).astype({"훈련기관": str, "훈련유형": str})
+        fig = px.bar(data, x="훈련기관", y="신청인원", title="상위 20개 훈련기관 신청인원", **common)
+        tickformat = ",d"
+    elif kind == "fees":
+        data = cube.top_institutes_by_type("교육비합계", 20).astype({"훈련기관": str, "훈련유형": str})
+        data["교육비 합계(억원)"] = data["교육비합계"] / 1e8
+        fig = px.bar(data, x="훈련기관", y="교육비 합계(억원)", title="상위 20개 훈련기관 교육비 합계", **common)
+        tickformat = ".1f"
+    else:
+        trend, x, points = trend_frame(cube, granularity, by_type=True)
+        trend = trend.astype({"훈련유형": str})
+        # 누적 보기에서는 면적 그래프로 유형별 몫과 전체 추이를 함께 보여줍니다.
+        plot = px.line if facet else px.area
+        shown = trend[x].nunique()
+        fig = plot(trend, x=x, y="신청인원", title=_trend_title(granularity, points, shown),
+                   markers=x != "개강일", **common)
+        tickformat = ",d"
+
+    fig.update_layout(
+        font=dict(size=16),
+        title_font=dict(size=18),
+        plot_bgcolor='#fafafa',
+        paper_bgcolor='#fafafa',
+        height=max(500, 220 * len(cube.types)) if facet else 500,
+        barmode='stack',
+        legend_title_text="훈련유형",
+    )
+    fig.update_yaxes(tickformat=tickformat)
+    # facet 제목의 "훈련유형=" 접두어를 떼어냅니다.
+    fig.for_each_annotation(lambda a: a.update(text=a.text.split("=", 1)[-1]))
+    if data is not None:
+        institutes = list(dict.fromkeys(data["훈련기관"]))
+        fig.update_xaxes(
+            categoryorder="array",
+            categoryarray=institutes,
+            tickvals=institutes,
+            ticktext=[
+                f"<b><span style='color:{HIGHLIGHT_COLOR}'>{name}</span></b>" if highlight(name) else name
+                for name in institutes
+            ],
+        )
+    return fig
+
+
+def build_figure(cube: AggregateCube, kind: str, type_layout: str = TYPE_LAYOUTS[0],
+                 highlight: Optional[Highlight] = None, granularity: str = GRANULARITIES[0]) -> go.Figure:
+    """그래프 하나(CHART_KINDS 중 하나)를 만듭니다."""
+    highlight = highlight or HighlightRules.parse(DEFAULT_HIGHLIGHT)
+    if len(cube.types) > 1:
+        return _type_figure(cube, kind, type_layout, granularity, highlight)
+    if kind == "trend":
+        return _trend_line(cube, granularity)
+    return _top_bar(cube, "신청인원" if kind == "applicants" else "교육비합계", highlight)
+
+
+def build_figures(cube: AggregateCube, type_layout: str = TYPE_LAYOUTS[0],
+                  highlight: Optional[Highlight] = None, granularity: str = GRANULARITIES[0]) -> List[go.Figure]:
+    """데이터 시각화용 그래프를 만듭니다. highlight(기관명)가 참인 기관은 강조 색으로 표시합니다."""
+    return [build_figure(cube, kind, type_layout, highlight, granularity) for kind in CHART_KINDS]
+
+
+def figure_options(cube: AggregateCube, kind: str, type_layout: str, highlight: HighlightRules,
+                   granularity: str) -> str:
+    """그래프 모양에 영향을 주는 옵션만 모은 캐시 키"""
+    options = [type_layout] if len(cube.types) > 1 else []
+    if kind == "trend":
+        options += [granularity, str(MAX_POINTS)]
+    else:
+        options.append(highlight.key)
+    return ":".join(options)
+
+
+# 프로세스 안의 모든 세션이 공유하는 그래프 JSON 캐시
+figure_cache = LRUCache(MAX_CACHED_FIGURES)
+
+
+def cached_figures(data_hash: str, cube: AggregateCube, type_layout: str = TYPE_LAYOUTS[0],
+                   highlight: Optional[HighlightRules] = None, granularity: str = GRANULARITIES[0],
+                   timings: Optional[Timings] = None) -> List[go.Figure]:
+    """그래프를 종류별로 캐시에서 꺼내거나 만들어 반환합니다.
+
+    캐시에는 직렬화한 JSON을 두고, 꺼낼 때는 검증 없이 Figure로 되살립니다.
+    """
+    highlight = highlight or HighlightRules.parse(DEFAULT_HIGHLIGHT)
+    figures = []
+    for kind in CHART_KINDS:
+        key = f"figure:{kind}:{figure_options(cube, kind, type_layout, highlight, granularity)}"
+        if timings:
+            timings.count("figure_cache_hits" if (data_hash, key) in figure_cache else "figure_cache_misses")
+        data = figure_cache.get_or_build(
+            data_hash, key,
+            lambda: build_figure(cube, kind, type_layout, highlight, granularity).to_json().encode("utf-8"),
+        )
+        figures.append(go.Figure(json.loads(data), _validate=False))
+    return figures
@@ -0,0 +1,112 @@
+"""수집 스냅숏 사이 변동 비교
+
+같은 개강일을 다시 수집하면 이전 스냅숏과 (과정ID, 회차) 키로 해시 조인해 새로 생긴 회차,
+사라진 회차, 신청인원이 바뀐 회차를 찾습니다. 이전 스냅숏으로 해시표를 만들고 새 스냅숏으로
+한 번 훑으므로 비용은 두 스냅숏 크기의 합에 비례합니다.
+
+파티션 저장소(partition_store.py)는 파티션을 덮어쓸 때마다 그 파티션의 변동만 기록해 두므로,
+대시보드는 전체 이력을 다시 비교하지 않고 조회 구간의 변동 기록만 모아 보여줍니다.
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from work24_parser import TrainingRecord
+
+NEW, REMOVED, CHANGED = "new", "removed", "changed"
+
+
+class Change(NamedTuple):
+    """회차 하나의 변동. 새 회차는 old_applicants, 사라진 회차는 new_applicants가 None입니다."""
+
+    kind: str
+    course_type: str
+    start_date: str
+    trpr_id: str
+    degree: str
+    institute: str
+    title: str
+    old_applicants: Optional[int]
+    new_applicants: Optional[int]
+
+    @property
+    def delta(self) -> int:
+        """신청인원 변화 (새 회차는 +신청인원, 사라진 회차는 -신청인원)"""
+        return (self.new_applicants or 0) - (self.old_applicants or 0)
+
+
+def snapshot_key(record: TrainingRecord) -> Tuple[str, str]:
+    """스냅숏 사이에서 같은 회차를 찾는 키 (과정ID, 회차)"""
+    return record.trpr_id, record.degree
+
+
+def diff_records(old: Iterable[TrainingRecord], new: Iterable[TrainingRecord],
+                 course_type: str = "") -> List[Change]:
+    """두 스냅숏의 변동을 반환합니다(신청인원만 바뀐 회차는 CHANGED). 훈련유형이 없는 행은 course_type으로 채웁니다."""
+    before: Dict[Tuple[str, str], TrainingRecord] = {snapshot_key(record): record for record in old}
+    changes: List[Change] = []
+    for record in new:
+        previous = before.pop(snapshot_key(record), None)
+        if previous is None:
+            changes.append(_change(NEW, record, course_type, None, record.applicants))
+        elif previous.applicants != record.applicants:
+            changes.append(_change(CHANGED, record, course_type, previous.applicants, record.applicants))
+    # 새 스냅숏에서 찾지 못한 회차
+    changes.extend(_change(REMOVED, record, course_type, record.applicants, None) for record in before.values())
+    return changes
+
+
+def _change(kind: str, record: TrainingRecord, course_type: str,
+            old_applicants: Optional[int], new_applicants: Optional[int]) -> Change:
+    return Change(kind, record.course_type or course_type, record.start_date, record.trpr_id, record.degree,
+                  record.institute, record.title, old_applicants, new_applicants)
+
+
+def net_changes(changes: Iterable[Change]) -> List[Change]:
+    """시간순 변동 기록을 회차마다 하나로 합칩니다(처음 기록 이전 스냅숏 → 마지막 스냅숏).
+
+    예를 들어 신청인원이 10→12, 12→15로 두 번 바뀐 회차는 10→15 하나가 되고,
+    생겼다가 사라진 회차는 빠집니다. 변동은 개강일 파티션마다 기록되므로 회차의 이전/현재 상태를
+    개강일별로 모아 비교합니다. 그래서 개강일을 옮긴 회차(옛 날짜의 REMOVED와 새 날짜의 NEW)는
+    옮긴 방향이나 기록 순서와 상관없이 새 개강일의 CHANGED 하나로 남습니다.
+    """
+    # 회차별로 개강일마다 처음 기록 이전 신청인원과 마지막 기록
+    before: Dict[Tuple[str, str, str], Dict[str, Optional[int]]] = defaultdict(dict)
+    after: Dict[Tuple[str, str, str], Dict[str, Change]] = defaultdict(dict)
+    for change in changes:
+        key = (change.course_type, change.trpr_id, change.degree)
+        before[key].setdefault(change.start_date, change.old_applicants)
+        after[key][change.start_date] = change
+    merged = []
+    for key, old_by_day in before.items():
+        latest = after[key]
+        old_days = sorted(day for day, applicants in old_by_day.items() if applicants is not None)
+        new_days = sorted(day for day, change in latest.items() if change.new_applicants is not None)
+        if not old_days and not new_days:
+            continue
+        old = sum(old_by_day[day] for day in old_days) if old_days else None
+        new = sum(latest[day].new_applicants for day in new_days) if new_days else None
+        kind = NEW if old is None else REMOVED if new is None else CHANGED
+        if kind == CHANGED and old == new and old_days == new_days:
+            continue
+        last = latest[new_days[-1]] if new_days else latest[old_days[-1]]
+        merged.append(last._replace(kind=kind, old_applicants=old, new_applicants=new))
+    return merged
+
+
+def institute_deltas(changes: Iterable[Change]) -> pd.DataFrame:
+    """훈련기관별 신규/사라진/변동 회차 수와 신청인원 변화 (변화 절댓값이 큰 순)"""
+    df = pd.DataFrame(list(changes), columns=Change._fields)
+    if df.empty:
+        return pd.DataFrame(columns=["훈련기관", "신규 회차", "사라진 회차", "변동 회차", "신청인원 변화"])
+    counts = pd.DataFrame({
+        "훈련기관": df["institute"],
+        "신규 회차": (df["kind"] == NEW).astype("int64"),
+        "사라진 회차": (df["kind"] == REMOVED).astype("int64"),
+        "변동 회차": (df["kind"] == CHANGED).astype("int64"),
+        "신청인원 변화": df["new_applicants"].fillna(0).astype("int64") - df["old_applicants"].fillna(0).astype("int64"),
+    })
+    table = counts.groupby("훈련기관", sort=True).sum()
+    order = table["신청인원 변화"].abs().sort_values(ascending=False, kind="stable").index
+    return table.loc[order].reset_index()
@@ -0,0 +1,61 @@
+"""엑셀/CSV 내보내기
+
+내보내기 파일은 사용자가 요청했을 때만 만들고, 만든 결과는 데이터셋 해시 단위로
+프로세스 안에서 재사용합니다(lru.LRUCache). 엑셀은 openpyxl write-only 모드로 행을 흘려 쓰고,
+CSV는 일정 행 수씩 나눠 만들어 큰 데이터에서도 메모리 사용량을 일정하게 유지합니다.
+"""
+import io
+from typing import Dict, Iterator, List
+
+import pandas as pd
+from openpyxl import Workbook
+
+from lru import LRUCache
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+CSV_MIME = "text/csv"
+CHUNK_ROWS = 10_000
+MAX_CACHED_EXPORTS = 8
+
+
+def _cells(series: pd.Series) -> List:
+    """엑셀 셀에 넣을 수 있는 파이썬 값 목록 (결측값은 빈 셀)
+
+    개강일처럼 시각이 없는 datetime 열은 date로 넣어 yyyy-mm-dd 날짜 셀이 되게 합니다
+    (Timestamp를 그대로 넣으면 'yyyy-mm-dd h:mm:ss' 셀이 됩니다).
+    """
+    if pd.api.types.is_datetime64_any_dtype(series) and (series.dropna() == series.dropna().dt.normalize()).all():
+        series = series.dt.date
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def write_xlsx(sheets: Dict[str, pd.DataFrame], chunk_rows: int = CHUNK_ROWS) -> bytes:
+    """시트 이름 → 데이터프레임을 write-only 엑셀 파일로 만듭니다."""
+    workbook = Workbook(write_only=True)
+    for name, df in sheets.items():
+        sheet = workbook.create_sheet(title=name)
+        sheet.append(list(df.columns))
+        for start in range(0, len(df), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            for row in zip(*(_cells(chunk[column]) for column in chunk.columns)):
+                sheet.append(row)
+    with io.BytesIO() as buffer:
+        workbook.save(buffer)
+        return buffer.getvalue()
+
+
+def iter_csv(df: pd.DataFrame, chunk_rows: int = CHUNK_ROWS) -> Iterator[bytes]:
+    """데이터프레임을 CSV(UTF-8 BOM) 바이트 청크로 나눠 반환합니다."""
+    yield "\ufeff".encode("utf-8")
+    for start in range(0, max(len(df), 1), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        yield chunk.to_csv(index=False, header=start == 0).encode("utf-8")
+
+
+def write_csv(df: pd.DataFrame, chunk_rows: int = CHUNK_ROWS) -> bytes:
+    """데이터프레임 전체를 CSV(UTF-8 BOM) 바이트로 만듭니다."""
+    return b"".join(iter_csv(df, chunk_rows))
+
+
+# 프로세스 안의 모든 세션이 공유하는 내보내기 캐시
+exports = LRUCache(MAX_CACHED_EXPORTS)
@@ -0,0 +1,150 @@
+"""훈련 데이터프레임 생성
+
+TrainingRecord를 행 단위 dict로 만들지 않고 열별 배열에 바로 쌓은 뒤
+DataFrame으로 넘깁니다. 숫자 열은 array('q') 버퍼를 NumPy 배열로 복사 없이
+감싸고, 문자열 열은 범주형 코드, 개강일은 고유 날짜만 변환한 datetime64로 만듭니다.
+
+열 dtype은 SCHEMA 한 곳에서 정합니다. 금액(교육비, 교육비합계)은 int64로 두어
+신청인원 × 교육비가 21억 원을 넘어도 넘치지 않게 하고, 인원은 uint16으로 줄입니다.
+"""
+import hashlib
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from work24_parser import COURSE_TYPES, TrainingRecord
+
+# 훈련 데이터프레임 스키마 (열 순서 포함)
+SCHEMA: Dict[str, str] = {
+    "훈련기관": "category",
+    "훈련과정명": "category",
+    "회차": "object",
+    "개강일": "datetime64[ns]",
+    "신청인원": "uint16",
+    "교육비": "int64",
+    "자격증": "category",
+    "교육비합계": "int64",
+    "훈련유형": "category",
+}
+COLUMNS = list(SCHEMA)
+
+
+class _CodeColumn:
+    """반복되는 문자열을 정수 코드와 고유값 목록으로 쌓는 열"""
+
+    def __init__(self):
+        self.codes = array("i")
+        self.values: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def append(self, value: str) -> None:
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def codes_array(self) -> np.ndarray:
+        return np.frombuffer(self.codes, dtype=np.int32) if len(self.codes) else np.empty(0, np.int32)
+
+    def categorical(self) -> pd.Categorical:
+        """범주를 사전순으로 정렬한 Categorical을 만듭니다(정렬 결과가 문자열과 같도록)."""
+        order = np.argsort(np.array(self.values, dtype=object), kind="stable")
+        rank = np.empty(len(order), dtype=np.int32)
+        rank[order] = np.arange(len(order), dtype=np.int32)
+        return pd.Categorical.from_codes(rank[self.codes_array()], [self.values[i] for i in order])
+
+
+class ColumnarBuilder:
+    """TrainingRecord를 열별 배열로 누적해 DataFrame을 만듭니다."""
+
+    def __init__(self):
+        self.institute = _CodeColumn()
+        self.start_date = _CodeColumn()
+        self.title = _CodeColumn()
+        self.certificate = _CodeColumn()
+        self.course_type = _CodeColumn()
+        self.degree: List[str] = []
+        self.applicants = array("q")
+        self.fee = array("q")
+
+    def __len__(self) -> int:
+        return len(self.applicants)
+
+    def append(self, record: TrainingRecord) -> None:
+        self.institute.append(record.institute)
+        self.start_date.append(record.start_date)
+        self.title.append(record.title)
+        self.degree.append(record.degree)
+        self.certificate.append(record.certificate)
+        # 훈련유형은 코드 대신 화면 표시 이름으로 둡니다(유형 없이 조회한 행은 빈 값).
+        self.course_type.append(COURSE_TYPES.get(record.course_type, record.course_type))
+        self.applicants.append(record.applicants)
+        self.fee.append(record.fee)
+
+    def extend(self, records: Iterable[TrainingRecord]) -> "ColumnarBuilder":
+        for record in records:
+            self.append(record)
+        return self
+
+    def to_frame(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """누적한 열로 DataFrame을 만듭니다. columns로 일부 열만 고를 수 있습니다."""
+        applicants = np.frombuffer(self.applicants, dtype=np.int64) if len(self) else np.empty(0, np.int64)
+        fee = np.frombuffer(self.fee, dtype=np.int64) if len(self) else np.empty(0, np.int64)
+        # 교육비합계는 int64에서 계산한 뒤에 인원 열을 줄입니다.
+        total_fee = applicants * fee
+        # 고유 날짜만 datetime64로 변환한 뒤 코드로 펼칩니다. 빈 값/잘못된 값은 NaT가 됩니다.
+        unique_dates = pd.to_datetime(pd.Series(self.start_date.values, dtype=object), errors="coerce").to_numpy()
+        data = {
+            "훈련기관": self.institute.categorical(),
+            "훈련과정명": self.title.categorical(),
+            "회차": self.degree,
+            "개강일": unique_dates[self.start_date.codes_array()],
+            "신청인원": downcast_count(applicants),
+            "교육비": fee,
+            "자격증": self.certificate.categorical(),
+            "교육비합계": total_fee,
+            "훈련유형": self.course_type.categorical(),
+        }
+        columns = columns or COLUMNS
+        return apply_schema(pd.DataFrame({name: data[name] for name in columns}, columns=columns))
+
+
+def downcast_count(values: np.ndarray) -> np.ndarray:
+    """인원 열을 uint16으로 줄입니다. 범위를 벗어나는 값이 있으면 int64를 유지합니다."""
+    limit = np.iinfo(np.uint16)
+    if len(values) and (values.min() < limit.min or values.max() > limit.max):
+        return values
+    return values.astype(np.uint16)
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """SCHEMA에 있는 열을 선언된 dtype으로 맞춥니다(이미 맞는 열은 그대로 둡니다).
+
+    인원 열이 uint16 범위를 넘으면 넘치지 않도록 int64로 둡니다.
+    """
+    dtypes = {}
+    for name, dtype in SCHEMA.items():
+        if name not in df.columns or str(df[name].dtype) == dtype:
+            continue
+        if dtype == "uint16":
+            values = df[name].to_numpy(dtype=np.int64)
+            if downcast_count(values).dtype != np.uint16:
+                continue
+        dtypes[name] = dtype
+    return df.astype(dtypes) if dtypes else df
+
+
+def build_frame(records: Iterable[TrainingRecord], columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """TrainingRecord 목록으로 훈련 데이터프레임을 만듭니다."""
+    return ColumnarBuilder().extend(records).to_frame(columns)
+
+
+def frame_hash(df: pd.DataFrame) -> str:
+    """데이터프레임 내용의 해시. 파생 결과(그래프, 내보내기 파일)의 캐시 키로 씁니다."""
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    digest = hashlib.sha256(row_hashes.tobytes())
+    digest.update(",".join(df.columns).encode("utf-8"))
+    return digest.hexdigest()
@@ -0,0 +1,111 @@
+"""고용24 배치 수집 CLI
+
+대시보드(app_v2.py)가 읽는 개강일 파티션 저장소를 미리 채웁니다.
+cron 등으로 주기 실행하면 대시보드는 저장소에서 바로 열리고,
+저장소에 없는 구간만 화면에서 실시간으로 수집합니다.
+
+    python ingest.py --days-back 90 --days-ahead 180
+    python ingest.py --types C0041A C0041T --max-age 1800
+    python ingest.py --days-back 1826 --archive   # HRD 아카이브(Parquet)에도 기록
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+import requests
+import xml.etree.ElementTree as ET
+from dotenv import load_dotenv
+from pytz import timezone
+
+# 프로젝트 모듈은 불러올 때 설정(HRD_*, WORK24_*)을 읽으므로 .env를 먼저 불러옵니다.
+load_dotenv()
+
+import archive
+from instrument import redact_text
+from partition_store import PartitionStore, sync_query
+from work24_parser import COURSE_TYPES
+
+logger = logging.getLogger("ingest")
+
+
+def ingest_type(store: PartitionStore, auth_key: str, crse: str, start: date, end: date,
+                history: Optional["archive.Archive"] = None) -> Dict:
+    """한 훈련유형의 조회 구간을 저장소와 동기화하고 결과 요약을 반환합니다.
+
+    history를 주면 빠짐없이 받은 결과를 HRD 아카이브에도 기록합니다.
+    """
+    started = time.perf_counter()
+    params = {
+        "authKey": auth_key,
+        "srchTraStDt": start.strftime("%Y%m%d"),
+        "srchTraEndDt": end.strftime("%Y%m%d"),
+        "crseTracseSe": crse,
+    }
+    try:
+        rows = sync_query(store, params)
+    except (requests.RequestException, ET.ParseError) as e:
+        logger.error(f"{crse or '전체'}: 수집 실패 - {redact_text(e)}")
+        return {"type": crse, "rows": 0, "ok": False, "seconds": time.perf_counter() - started}
+    ok = rows.complete
+    if history is not None and ok:
+        try:
+            history.put_range(crse, start, end, rows)
+        except Exception as e:
+            # 아카이브 쓰기 실패는 이 유형만 실패로 치고 다른 유형의 수집은 그대로 끝냅니다.
+            logger.error(f"{crse or '전체'}: 아카이브 저장 실패 - {redact_text(e)}")
+            ok = False
+    return {
+        "type": crse,
+        "rows": len(rows),
+        "ok": ok,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="고용24 데이터를 대시보드 저장소로 미리 수집합니다.")
+    parser.add_argument("--types", nargs="+", default=list(COURSE_TYPES),
+                        help="수집할 훈련유형 코드 (기본: C0041T/B/N/A/H, 대시보드의 \"전체\"는 이 유형들을 합칩니다)")
+    parser.add_argument("--days-back", type=int, default=90, help="오늘(KST) 기준 과거 일수")
+    parser.add_argument("--days-ahead", type=int, default=180, help="오늘(KST) 기준 미래 일수")
+    parser.add_argument("--max-age", type=float, default=0,
+                        help="이 시간(초)보다 최근에 수집한 날짜는 건너뜁니다 (기본 0: 모두 새로 수집)")
+    parser.add_argument("--workers", type=int, default=len(COURSE_TYPES), help="동시에 수집할 훈련유형 수")
+    parser.add_argument("--archive", action="store_true",
+                        help="수집 결과를 HRD 아카이브(Parquet, HRD_ARCHIVE_DIR)에도 기록합니다 (pyarrow 필요)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    auth_key = os.getenv("AUTH_KEY", "")
+    if not auth_key:
+        logger.error("AUTH_KEY 환경변수가 설정되어 있지 않습니다.")
+        return 2
+
+    today = datetime.now(timezone("Asia/Seoul")).date()
+    start = today - timedelta(days=args.days_back)
+    end = today + timedelta(days=args.days_ahead)
+    store = PartitionStore(ttl=args.max_age)
+    history = None
+    if args.archive:
+        if not archive.available():
+            logger.error("--archive를 쓰려면 pyarrow를 설치해야 합니다.")
+            return 2
+        history = archive.Archive()
+    logger.info(f"{start}~{end} 구간을 {len(args.types)}개 훈련유형으로 수집합니다.")
+
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        summaries = list(pool.map(lambda crse: ingest_type(store, auth_key, crse, start, end, history), args.types))
+
+    for summary in summaries:
+        status = "완료" if summary["ok"] else "불완전"
+        logger.info(f"{summary['type'] or '전체'}: {summary['rows']:,}건 {status} ({summary['seconds']:.1f}초)")
+    return 0 if all(summary["ok"] for summary in summaries) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""수집 경로 계측
+
+행이나 페이지마다 INFO 로그를 남기는 대신, 조회 한 번(FetchStats 하나)에 대해
+페이지별 구간 시간(request: 응답 헤더까지, network: 본문 수신, parse: XML 파싱과
+레코드 변환, convert: 데이터프레임 생성)과 행/페이지/바이트 카운터를 모았다가
+조회가 끝날 때 요약 한 줄만 남깁니다.
+
+페이지별 상세 기록은 DEBUG가 켜져 있을 때 SAMPLE_RATE 비율로만 남기고,
+로그에 들어가는 조회 조건과 오류 메시지의 인증키는 항상 가립니다.
+
+Timings는 이름 붙인 구간 시간과 카운터를 모으는 범용 계측 컨텍스트로,
+대시보드의 성능 패널과 회귀 측정용 JSON 덤프에도 그대로 씁니다.
+"""
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional
+
+SAMPLE_RATE = float(os.getenv("WORK24_DEBUG_SAMPLE", "0.01"))  # DEBUG 페이지 기록 비율
+SPANS = ("request", "network", "parse", "convert")
+COUNTERS = ("rows", "pages", "bytes", "failed_pages", "retries")
+
+# 이름에 이 단어가 들어간 파라미터/헤더 값은 로그에 남기지 않습니다.
+SECRET_NAMES = ("authkey", "key", "token", "secret", "password", "authorization", "cookie")
+_SECRET_QUERY = re.compile(r"((?:authKey|serviceKey|token|apiKey)=)[^&\s'\"]+", re.IGNORECASE)
+REDACTED = "***"
+
+
+def is_secret(name: str) -> bool:
+    lowered = name.lower()
+    return any(secret in lowered for secret in SECRET_NAMES)
+
+
+def redact(values: Mapping[str, str]) -> Dict[str, str]:
+    """파라미터나 헤더에서 비밀 값을 가린 사본을 반환합니다."""
+    return {name: REDACTED if is_secret(name) else value for name, value in values.items()}
+
+
+def redact_text(text: object) -> str:
+    """URL 쿼리 문자열 형태로 들어간 인증키를 가립니다(예외 메시지 등)."""
+    return _SECRET_QUERY.sub(rf"\1{REDACTED}", str(text))
+
+
+class PageTimer:
+    """한 페이지의 구간 시간과 바이트 수를 잠금 없이 모읍니다. 끝나면 FetchStats에 한 번에 더합니다."""
+
+    __slots__ = ("spans", "bytes", "_started")
+
+    def __init__(self):
+        self.spans: Dict[str, float] = {}
+        self.bytes = 0
+        self._started = time.perf_counter()
+
+    def lap(self, span: str) -> None:
+        """직전 lap(또는 생성) 이후 흐른 시간을 span에 더합니다."""
+        now = time.perf_counter()
+        self.spans[span] = self.spans.get(span, 0.0) + now - self._started
+        self._started = now
+
+    def count_chunks(self, chunks: Iterable[bytes], parse_span: str = "parse",
+                     network_span: str = "network") -> Iterator[bytes]:
+        """응답 청크를 넘기면서 청크 수신 시간은 network, 그 사이 소비자(파서) 시간은 parse로 나눕니다."""
+        for chunk in chunks:
+            self.lap(network_span)
+            self.bytes += len(chunk)
+            yield chunk
+            self.lap(parse_span)
+
+
+class Timings:
+    """이름 붙인 구간 시간(합계/최대/횟수)과 카운터를 모읍니다. 여러 스레드가 함께 씁니다.
+
+    구간은 처음 기록된 순서를 유지하므로 화면이나 JSON에서 실행 순서대로 보입니다.
+    """
+
+    def __init__(self, label: str = "", spans: Iterable[str] = (), counters: Iterable[str] = ()):
+        self.label = label
+        self.totals: Dict[str, float] = dict.fromkeys(spans, 0.0)
+        self.maxima: Dict[str, float] = dict.fromkeys(spans, 0.0)
+        self.calls: Dict[str, int] = dict.fromkeys(spans, 0)
+        self.counters: Dict[str, int] = dict.fromkeys(counters, 0)
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _add(self, span: str, seconds: float) -> None:
+        self.totals[span] = self.totals.get(span, 0.0) + seconds
+        self.maxima[span] = max(self.maxima.get(span, 0.0), seconds)
+        self.calls[span] = self.calls.get(span, 0) + 1
+
+    def add(self, span: str, seconds: float) -> None:
+        with self._lock:
+            self._add(span, seconds)
+
+    def count(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """with 블록의 실행 시간을 name 구간에 더합니다."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def summary(self) -> Dict[str, float]:
+        """카운터, 구간별 합계/최대 시간(초), 전체 경과 시간을 하나의 dict로 반환합니다."""
+        with self._lock:
+            summary: Dict[str, float] = dict(self.counters)
+            for span, seconds in self.totals.items():
+                summary[f"{span}_seconds"] = round(seconds, 4)
+                summary[f"{span}_max_seconds"] = round(self.maxima[span], 4)
+        summary["elapsed_seconds"] = round(time.perf_counter() - self._started, 4)
+        return summary
+
+    def rows(self) -> List[Dict[str, object]]:
+        """구간별 (이름, 횟수, 합계, 최대) 목록. 화면 표 용도입니다."""
+        with self._lock:
+            return [
+                {"구간": span, "횟수": self.calls[span], "합계(ms)": round(seconds * 1000, 1),
+                 "최대(ms)": round(self.maxima[span] * 1000, 1)}
+                for span, seconds in self.totals.items() if self.calls[span]
+            ]
+
+    def to_json(self, indent: Optional[int] = 2, **extra: object) -> str:
+        """회귀 측정용 JSON (label, extra 필드, summary). indent=None이면 한 줄(JSON Lines)입니다."""
+        return json.dumps({"label": self.label, **extra, **self.summary()}, ensure_ascii=False, indent=indent)
+
+
+class FetchStats(Timings):
+    """조회 한 번의 페이지 구간 시간과 행/페이지/바이트 카운터"""
+
+    def __init__(self, label: str = "조회"):
+        super().__init__(label, SPANS, COUNTERS)
+
+    def add_page(self, timer: PageTimer, rows: int) -> None:
+        with self._lock:
+            for span, seconds in timer.spans.items():
+                self._add(span, seconds)
+            self.counters["pages"] += 1
+            self.counters["rows"] += rows
+            self.counters["bytes"] += timer.bytes
+
+    def log_summary(self, logger: logging.Logger, level: int = logging.INFO) -> None:
+        """조회 한 번에 한 줄만 남기는 요약 로그"""
+        if not logger.isEnabledFor(level):
+            return
+        s = self.summary()
+        spans = " ".join(
+            f"{span} {s[f'{span}_seconds']:.2f}s(최대 {s[f'{span}_max_seconds']:.2f}s)"
+            for span in self.totals if s[f"{span}_seconds"]
+        )
+        logger.log(
+            level,
+            f"{self.label}: {s['rows']:,}행, {s['pages']:,}페이지"
+            f"(실패 {s['failed_pages']}, 재시도 {s['retries']}), {s['bytes'] / 1e6:.1f}MB, "
+            f"경과 {s['elapsed_seconds']:.2f}s / {spans}",
+        )
+
+
+def sampled(logger: logging.Logger, rate: Optional[float] = None) -> bool:
+    """DEBUG가 켜져 있을 때 rate(기본 SAMPLE_RATE) 비율로 True를 반환합니다.
+
+    메시지를 만들기 전에 확인해 표본에 들지 않은 페이지는 문자열 포맷 비용도 들지 않게 합니다.
+    """
+    return logger.isEnabledFor(logging.DEBUG) and random.random() < (SAMPLE_RATE if rate is None else rate)
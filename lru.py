@@ -0,0 +1,39 @@
+"""프로세스 안에서 만든 결과를 재사용하는 작은 LRU 캐시
+
+(데이터셋 해시, 종류) 키로 바이트를 보관합니다. 내보내기 파일(export.py)과
+그래프 JSON(charts.py)이 같은 캐시 구현을 씁니다. 여러 세션 스레드가 함께 쓰므로
+항목 접근은 잠금으로 보호하고, 만드는 작업(build)은 잠금 밖에서 실행합니다.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Tuple
+
+Key = Tuple[str, str]
+
+
+class LRUCache:
+    """(데이터셋 해시, 종류) → 바이트를 최대 max_entries개 보관하는 LRU 캐시"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Key, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: Key) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def get_or_build(self, data_hash: str, kind: str, build: Callable[[], bytes]) -> bytes:
+        """캐시에 있으면 그대로, 없으면 build()로 만들어 저장한 뒤 반환합니다."""
+        key = (data_hash, kind)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        data = build()
+        with self._lock:
+            self._entries[key] = data
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return data
@@ -0,0 +1,294 @@
+"""개강일 단위 파티션 저장소
+
+조회 결과(TrainingRecord)를 (훈련유형, 개강일) 파티션으로 나눠 SQLite에 보관합니다.
+새 조회는 저장소에 없거나 TTL이 지난 날짜만 고용24에서 받아오고,
+나머지는 저장소에서 조립하므로 기간을 며칠 옮긴 조회는 옮긴 만큼만 요청합니다.
+빠진 구간은 (훈련유형, 월) 단위로 나눠 동시에 수집하고, 구간이 끝나는 대로
+저장하므로 몇 년짜리, 여러 유형 조회도 XML 응답을 한꺼번에 들고 있지 않습니다.
+
+파티션을 덮어쓸 때는 이전 스냅숏과 비교한 변동(diff.py)을 changes 표에 남깁니다.
+변동의 changed_at은 새 스냅숏의 수집 시각(버전)이며, CHANGE_RETENTION보다 오래된 기록은 지웁니다.
+"""
+import json
+import logging
+import os
+import time
+import zlib
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from cache_store import CACHE_DIR, DEFAULT_TTL, connect
+from diff import Change, diff_records
+from instrument import FetchStats
+from work24 import (
+    DEFAULT_CHUNK_WORKERS, FetchResult, PageCallback, Work24Client, dedupe_records, fetch_rows,
+    month_windows, split_course_types,
+)
+from work24_parser import TrainingRecord
+
+logger = logging.getLogger(__name__)
+
+DAY_FORMAT = "%Y-%m-%d"
+CHANGE_RETENTION = 90 * 24 * 3600  # 변동 기록 보관 기간(초)
+DateRange = Tuple[date, date]
+# (완료한 구간 수, 전체 구간 수, 지금까지 받은 행 수)
+ProgressCallback = Callable[[int, int, int], None]
+
+
+def iter_days(start: date, end: date) -> Iterator[date]:
+    """start부터 end까지(양끝 포함) 하루씩 반환합니다."""
+    for offset in range((end - start).days + 1):
+        yield start + timedelta(days=offset)
+
+
+def group_ranges(days: List[date]) -> List[DateRange]:
+    """정렬된 날짜 목록을 연속 구간 목록으로 묶습니다."""
+    ranges: List[DateRange] = []
+    for day in days:
+        if ranges and ranges[-1][1] + timedelta(days=1) == day:
+            ranges[-1] = (ranges[-1][0], day)
+        else:
+            ranges.append((day, day))
+    return ranges
+
+
+def _decode(blob: bytes) -> List[TrainingRecord]:
+    return [TrainingRecord(*row) for row in json.loads(zlib.decompress(blob))]
+
+
+class PartitionStore:
+    """(훈련유형, 개강일) 파티션별 행 목록과 수집 시각을 저장합니다."""
+
+    def __init__(self, path: Optional[str] = None, ttl: float = DEFAULT_TTL):
+        self.path = path or os.path.join(CACHE_DIR, "partitions.sqlite3")
+        self.ttl = ttl
+        conn = connect(self.path, create=True)
+        try:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS partitions (
+                    crse TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    row_count INTEGER NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (crse, day)
+                )"""
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS changes (
+                    changed_at REAL NOT NULL,
+                    crse TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    trpr_id TEXT NOT NULL,
+                    degree TEXT NOT NULL,
+                    institute TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    old_applicants INTEGER,
+                    new_applicants INTEGER
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS changes_window ON changes(crse, day, changed_at)")
+        finally:
+            conn.close()
+
+    def missing_ranges(self, crse: str, start: date, end: date,
+                       max_age: Optional[float] = None) -> List[DateRange]:
+        """저장소에 없거나 max_age(기본: TTL)보다 오래된 날짜를 연속 구간으로 묶어 반환합니다."""
+        conn = connect(self.path)
+        try:
+            fresh = {
+                day for (day,) in conn.execute(
+                    "SELECT day FROM partitions WHERE crse = ? AND day BETWEEN ? AND ? AND fetched_at >= ?",
+                    (crse, start.strftime(DAY_FORMAT), end.strftime(DAY_FORMAT),
+                     time.time() - (self.ttl if max_age is None else max_age)),
+                )
+            }
+        finally:
+            conn.close()
+        return group_ranges([d for d in iter_days(start, end) if d.strftime(DAY_FORMAT) not in fresh])
+
+    def put_range(self, crse: str, start: date, end: date, rows: List[TrainingRecord]) -> List[Change]:
+        """start~end 구간의 수집 결과를 날짜별로 나눠 저장합니다.
+
+        결과가 없는 날짜도 빈 파티션으로 저장해 TTL 동안 다시 요청하지 않습니다.
+        이미 저장된 날짜는 덮어쓰기 전에 이전 스냅숏과 비교해 변동을 기록하고, 기록한 변동을 반환합니다.
+        """
+        days = [d.strftime(DAY_FORMAT) for d in iter_days(start, end)]
+        by_day: Dict[str, List[TrainingRecord]] = defaultdict(list)
+        for row in rows:
+            by_day[row.start_date].append(row)
+        outside = set(by_day) - set(days)
+        if outside:
+            # 구간 밖 날짜는 다른 파티션을 덮어쓰지 않도록 버립니다.
+            logger.warning(f"조회 구간 밖의 개강일 {len(outside)}개를 건너뜁니다.")
+        now = time.time()
+        conn = connect(self.path)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # 처음 저장하는 날짜는 비교할 스냅숏이 없으므로 변동으로 치지 않습니다.
+            previous = conn.execute(
+                "SELECT day, value FROM partitions WHERE crse = ? AND day BETWEEN ? AND ?",
+                (crse, days[0], days[-1]),
+            ).fetchall()
+            changes = [
+                change for day, blob in previous
+                for change in diff_records(_decode(blob), by_day.get(day, []), crse)
+            ]
+            conn.executemany(
+                "INSERT INTO changes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(now, crse, change.start_date, change.kind, change.trpr_id, change.degree, change.institute,
+                  change.title, change.old_applicants, change.new_applicants) for change in changes],
+            )
+            conn.execute("DELETE FROM changes WHERE changed_at < ?", (now - CHANGE_RETENTION,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO partitions VALUES (?, ?, ?, ?, ?)",
+                [
+                    (crse, day,
+                     zlib.compress(json.dumps(by_day.get(day, []), ensure_ascii=False).encode("utf-8")),
+                     len(by_day.get(day, [])), now)
+                    for day in days
+                ],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return changes
+
+    def changes(self, crse: str, start: date, end: date, since: float) -> List[Change]:
+        """start~end 개강분에서 since(유닉스 시각) 이후 기록된 변동 (오래된 순)"""
+        conn = connect(self.path)
+        try:
+            rows = conn.execute(
+                "SELECT kind, crse, day, trpr_id, degree, institute, title, old_applicants, new_applicants "
+                "FROM changes WHERE crse = ? AND day BETWEEN ? AND ? AND changed_at >= ? ORDER BY changed_at, rowid",
+                (crse, start.strftime(DAY_FORMAT), end.strftime(DAY_FORMAT), since),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [Change(*row) for row in rows]
+
+    def load(self, crse: str, start: date, end: date) -> List[TrainingRecord]:
+        """start~end 구간의 행을 개강일 순서로 조립합니다."""
+        conn = connect(self.path)
+        try:
+            blobs = conn.execute(
+                "SELECT value FROM partitions WHERE crse = ? AND day BETWEEN ? AND ? ORDER BY day",
+                (crse, start.strftime(DAY_FORMAT), end.strftime(DAY_FORMAT)),
+            ).fetchall()
+        finally:
+            conn.close()
+        records = [record for (blob,) in blobs for record in _decode(blob)]
+        if crse:
+            # 훈련유형 필드가 생기기 전에 저장된 파티션도 파티션의 유형으로 표시합니다.
+            records = [row if row.course_type == crse else row._replace(course_type=crse) for row in records]
+        return records
+
+
+def sync_types(store: PartitionStore, crses: List[str], start: date, end: date,
+               fetch: Callable[[str, date, date], List[TrainingRecord]],
+               on_progress: Optional[ProgressCallback] = None,
+               chunk_workers: int = DEFAULT_CHUNK_WORKERS,
+               max_age: Optional[float] = None) -> FetchResult:
+    """여러 훈련유형의 빠진 날짜 구간만 fetch로 받아 저장한 뒤 전체 구간을 조립해 반환합니다.
+
+    빠진 구간은 (훈련유형, 월) 단위로 나눠 한 풀에서 동시에 받고, 받는 대로 저장합니다.
+    유형마다 최소 한 구간씩은 함께 진행되도록 풀 크기를 유형 수 이상으로 잡습니다.
+    on_progress는 구간 하나가 끝날 때마다 호출한 스레드에서 불립니다.
+    일부 페이지가 빠진 수집 결과(FetchResult.complete가 False)는 저장하지 않고
+    이번 결과에만 섞어 돌려주며, 빠진 페이지는 failed_pages로 전달합니다.
+    max_age를 주면 저장소의 TTL 대신 그보다 오래된 날짜를 다시 받습니다(미리 갱신용).
+    """
+    chunks = [
+        (crse, *window)
+        for crse in crses
+        for s, e in store.missing_ranges(crse, start, end, max_age)
+        for window in month_windows(s, e)
+    ]
+    if chunks:
+        fetched_days = sum((e - s).days + 1 for _, s, e in chunks)
+        logger.info(f"{', '.join(c or '전체' for c in crses)}: {(end - start).days + 1}일 × {len(crses)}개 유형 중 "
+                    f"{fetched_days}일을 {len(chunks)}개 구간으로 나눠 새로 수집합니다.")
+    partial = FetchResult()
+    fetched_rows = 0
+    workers = max(1, min(max(chunk_workers, len(crses)), len(chunks) or 1))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetch, *chunk): chunk for chunk in chunks}
+        for done, future in enumerate(as_completed(futures), 1):
+            crse, range_start, range_end = futures[future]
+            rows = future.result()
+            fetched_rows += len(rows)
+            if getattr(rows, "complete", True):
+                store.put_range(crse, range_start, range_end, rows)
+            else:
+                partial.extend(rows)
+                partial.failed_pages.extend(rows.failed_pages)
+            del rows
+            if on_progress:
+                on_progress(done, len(chunks), fetched_rows)
+    records = [row for crse in crses for row in store.load(crse, start, end)]
+    if partial or len(crses) > 1:
+        # 저장된 파티션과 같은 개강일 순서로 합칩니다(정렬은 안정적이므로 같은 날은 유형 순서 유지).
+        records = sorted(records + list(partial), key=lambda row: row.start_date)
+    return FetchResult(dedupe_records(records), partial.failed_pages)
+
+
+def sync_range(store: PartitionStore, crse: str, start: date, end: date,
+               fetch: Callable[[date, date], List[TrainingRecord]],
+               on_progress: Optional[ProgressCallback] = None,
+               chunk_workers: int = DEFAULT_CHUNK_WORKERS) -> FetchResult:
+    """한 훈련유형에 대한 sync_types"""
+    return sync_types(store, [crse], start, end, lambda _, s, e: fetch(s, e), on_progress, chunk_workers)
+
+
+def parse_day(value: str) -> date:
+    """API 파라미터 형식(YYYYMMDD)의 날짜를 date로 변환합니다."""
+    return datetime.strptime(value, "%Y%m%d").date()
+
+
+def sync_query(store: PartitionStore, params: Dict[str, str],
+               client: Optional[Work24Client] = None,
+               on_progress: Optional[ProgressCallback] = None,
+               stats: Optional[FetchStats] = None,
+               on_page: Optional[PageCallback] = None,
+               max_age: Optional[float] = None) -> FetchResult:
+    """조회 조건(authKey, srchTraStDt, srchTraEndDt, crseTracseSe)을 저장소와 동기화하고
+    조회 구간 전체의 회차를 반환합니다. 대시보드와 배치 수집이 함께 사용합니다.
+
+    crseTracseSe에 쉼표로 여러 훈련유형을 주면 유형별로 동시에 수집해 하나로 합치고,
+    각 행의 course_type에 유형 코드가 붙습니다.
+    stats를 주지 않으면 구간 수집 전체의 계측 요약을 한 줄 로그로 남깁니다.
+    on_page는 새로 받은 페이지마다 구간 수집 스레드에서 불립니다(저장소에 있던 날짜는 제외).
+    max_age는 sync_types와 같습니다.
+    """
+    def fetch(crse: str, range_start: date, range_end: date) -> FetchResult:
+        rows = fetch_rows({
+            **params,
+            "crseTracseSe": crse,
+            "srchTraStDt": range_start.strftime("%Y%m%d"),
+            "srchTraEndDt": range_end.strftime("%Y%m%d"),
+        }, client, summary, on_page)
+        logger.debug(f"{crse or '전체'} {range_start}~{range_end}: {len(rows)}개의 데이터를 찾았습니다.")
+        return rows
+
+    summary = stats or FetchStats(
+        f"동기화 {params.get('crseTracseSe') or '전체'} {params['srchTraStDt']}~{params['srchTraEndDt']}"
+    )
+    try:
+        return sync_types(
+            store,
+            split_course_types(params.get("crseTracseSe", "")),
+            parse_day(params["srchTraStDt"]),
+            parse_day(params["srchTraEndDt"]),
+            fetch,
+            on_progress,
+            max_age=max_age,
+        )
+    finally:
+        if stats is None:
+            summary.log_summary(logger)
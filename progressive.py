@@ -0,0 +1,89 @@
+"""수집 중간 결과 점진 표시
+
+BackgroundFetch는 수집 함수를 백그라운드 스레드(생산자)에서 실행하고, 받은 페이지와
+진행률을 큐로 넘깁니다. Streamlit 스크립트 스레드(소비자)는 큐를 비우면서 중간 결과를
+모으고, RefreshSchedule이 정한 때에만 요약 지표/그래프/표를 다시 그립니다.
+Streamlit 호출은 모두 스크립트 스레드에서만 하므로 수집 스레드는 화면을 모릅니다.
+
+중간 화면은 모은 행 전체로 다시 만들기 때문에, 다시 그리는 간격을 페이지 수에 비례해
+늘려(기본: N페이지 또는 지금까지의 절반 중 큰 쪽) 전체 비용이 행 수에 선형이 되게 합니다.
+첫 페이지는 바로 그리므로 첫 화면까지의 시간은 페이지 하나의 지연입니다.
+"""
+import os
+import queue
+import threading
+import time
+from typing import Callable, Generic, Iterator, Optional, Tuple, TypeVar
+
+from partition_store import ProgressCallback
+from work24 import PageCallback
+
+T = TypeVar("T")
+# 화면을 다시 그리는 최소 페이지 간격과 최소 시간 간격(초)
+REFRESH_PAGES = int(os.getenv("HRD_REFRESH_PAGES", "5"))
+REFRESH_SECONDS = 0.5
+Event = Tuple[str, object]
+
+
+class BackgroundFetch(Generic[T]):
+    """run(on_page, on_progress)를 백그라운드 스레드에서 실행하는 생산자
+
+    events()는 ("page", 회차 목록)과 ("progress", (완료, 전체, 행 수)) 이벤트를
+    도착한 순서대로 돌려주고 수집이 끝나면 멈춥니다. 결과와 오류는 result()로 받습니다.
+    """
+
+    def __init__(self, run: Callable[[PageCallback, ProgressCallback], T]):
+        self._events: "queue.Queue[Event]" = queue.Queue()
+        self._result: Optional[T] = None
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, args=(run,), name="background-fetch", daemon=True)
+        self._thread.start()
+
+    def _run(self, run: Callable[[PageCallback, ProgressCallback], T]) -> None:
+        try:
+            self._result = run(
+                lambda rows: self._events.put(("page", rows)),
+                lambda done, total, rows: self._events.put(("progress", (done, total, rows))),
+            )
+        except BaseException as e:  # 스크립트 스레드에서 다시 발생시킵니다.
+            self._error = e
+        finally:
+            self._events.put(("done", None))
+
+    def events(self) -> Iterator[Event]:
+        while True:
+            kind, value = self._events.get()
+            if kind == "done":
+                return
+            yield kind, value
+
+    def result(self) -> T:
+        """수집 결과를 반환합니다. 수집 중 오류가 났으면 그대로 다시 발생시킵니다."""
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class RefreshSchedule:
+    """중간 결과를 다시 그릴 때를 정합니다: 첫 페이지, 이후 간격이 차고 최소 시간도 지났을 때"""
+
+    def __init__(self, pages: int = REFRESH_PAGES, seconds: float = REFRESH_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.pages = max(1, pages)
+        self.seconds = seconds
+        self.clock = clock
+        self.seen = 0
+        self.next_refresh = 1
+        self.last_refresh = float("-inf")
+        self.refreshes = 0
+
+    def add_page(self) -> bool:
+        """페이지 하나를 받았다고 기록하고, 지금 다시 그려야 하면 True를 반환합니다."""
+        self.seen += 1
+        if self.seen < self.next_refresh or self.clock() - self.last_refresh < self.seconds:
+            return False
+        self.next_refresh = self.seen + max(self.pages, self.seen // 2)
+        self.last_refresh = self.clock()
+        self.refreshes += 1
+        return True
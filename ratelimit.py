@@ -0,0 +1,206 @@
+"""고용24 API 요청 속도 제한과 적응형 동시성 제어
+
+- TokenBucket: 한 프로세스의 모든 수집이 공유하는 토큰 버킷
+- SqliteTokenBucket: 여러 프로세스(Streamlit 워커, 배치 수집)가 SQLite 파일
+  하나로 같은 버킷을 나눠 쓰는 토큰 버킷
+- AdaptiveConcurrency: 지연 시간이나 오류율이 오르면 동시 요청 수를 절반으로
+  줄이고, API가 건강하면 한 개씩 늘리는(AIMD) 동시성 제한
+
+각 객체는 metrics()로 현재 요청 속도, 진행 중 요청 수, 스로틀 횟수를 돌려줍니다.
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from cache_store import connect
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE = float(os.getenv("WORK24_RATE", "10"))  # 초당 요청 수
+DEFAULT_BURST = int(os.getenv("WORK24_BURST", "10"))
+RATE_WINDOW = 10.0  # 관측 요청 속도를 계산하는 구간(초)
+
+
+class _RateMeter:
+    """최근 RATE_WINDOW초 동안의 요청 시각으로 관측 속도를 계산합니다."""
+
+    def __init__(self):
+        self._times: Deque[float] = deque()
+        self.throttle_events = 0
+
+    def record(self, now: float) -> None:
+        self._times.append(now)
+        while self._times and now - self._times[0] > RATE_WINDOW:
+            self._times.popleft()
+
+    def rate(self, now: float) -> float:
+        while self._times and now - self._times[0] > RATE_WINDOW:
+            self._times.popleft()
+        return len(self._times) / RATE_WINDOW
+
+
+class TokenBucket:
+    """초당 rate개의 토큰을 채우고 최대 burst개까지 쌓는 토큰 버킷"""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._meter = _RateMeter()
+
+    def _take(self) -> float:
+        """토큰을 하나 가져오면 0, 모자라면 기다려야 할 시간(초)을 반환합니다."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self._meter.record(now)
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        """토큰을 하나 얻을 때까지 기다립니다."""
+        wait = self._take()
+        if wait:
+            with self._lock:
+                self._meter.throttle_events += 1
+        while wait:
+            time.sleep(wait)
+            wait = self._take()
+
+    def metrics(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "rate": self._meter.rate(time.monotonic()),
+                "throttle_events": self._meter.throttle_events,
+            }
+
+
+class SqliteTokenBucket(TokenBucket):
+    """SQLite 파일에 버킷 상태를 두어 여러 프로세스가 함께 쓰는 토큰 버킷"""
+
+    def __init__(self, path: str, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST,
+                 name: str = "work24"):
+        super().__init__(rate, burst)
+        self.path = path
+        self.name = name
+        conn = connect(path, create=True)
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, tokens REAL, updated REAL)"
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO buckets VALUES (?, ?, ?)", (name, float(burst), time.time())
+            )
+        finally:
+            conn.close()
+
+    def _take(self) -> float:
+        # 프로세스 간에는 단조 시계를 공유할 수 없으므로 벽시계를 씁니다.
+        conn = connect(self.path)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            tokens, updated = conn.execute(
+                "SELECT tokens, updated FROM buckets WHERE name = ?", (self.name,)
+            ).fetchone()
+            now = time.time()
+            tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+            conn.execute(
+                "UPDATE buckets SET tokens = ?, updated = ? WHERE name = ?", (tokens, now, self.name)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        if not wait:
+            with self._lock:
+                self._meter.record(time.monotonic())
+        return wait
+
+
+class AdaptiveConcurrency:
+    """AIMD 방식으로 동시 요청 수를 조절하는 세마포어
+
+    요청이 실패하거나 지연 시간이 target_latency를 넘으면 한도를 절반으로 줄이고,
+    한도만큼 연속으로 빠르게 성공하면 한도를 1 늘립니다.
+    """
+
+    def __init__(self, maximum: int, minimum: int = 1, initial: Optional[int] = None,
+                 target_latency: float = 5.0):
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.limit = min(self.maximum, max(self.minimum, initial or self.maximum))
+        self.target_latency = target_latency
+        self.in_flight = 0
+        self.throttle_events = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            if self.in_flight >= self.limit:
+                self.throttle_events += 1
+            while self.in_flight >= self.limit:
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, latency: float, ok: bool) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            if not ok or latency > self.target_latency:
+                new_limit = max(self.minimum, self.limit // 2)
+                if new_limit < self.limit:
+                    logger.warning(f"API 응답이 느리거나 실패해 동시 요청 수를 {self.limit} → {new_limit}로 줄입니다.")
+                self.limit = new_limit
+                self._successes = 0
+            else:
+                self._successes += 1
+                if self._successes >= self.limit and self.limit < self.maximum:
+                    self.limit += 1
+                    self._successes = 0
+            self._cond.notify_all()
+
+    def cancel(self) -> None:
+        """요청을 보내지 못한 자리를 한도 조정 없이 돌려줍니다."""
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def metrics(self) -> Dict[str, float]:
+        with self._cond:
+            return {
+                "concurrency_limit": self.limit,
+                "in_flight": self.in_flight,
+                "concurrency_throttle_events": self.throttle_events,
+            }
+
+
+_shared_bucket: Optional[TokenBucket] = None
+_shared_bucket_lock = threading.Lock()
+
+
+def shared_bucket() -> TokenBucket:
+    """프로세스에서 공유하는 토큰 버킷을 반환합니다.
+
+    WORK24_RATE_DB 환경변수에 경로가 있으면 그 SQLite 파일로 프로세스 간에도 공유합니다.
+    """
+    global _shared_bucket
+    with _shared_bucket_lock:
+        if _shared_bucket is None:
+            path = os.getenv("WORK24_RATE_DB")
+            _shared_bucket = SqliteTokenBucket(path) if path else TokenBucket()
+        return _shared_bucket
@@ -0,0 +1,109 @@
+"""조회 결과 백그라운드 갱신(stale-while-revalidate)
+
+soft TTL이 지난 결과는 사용자에게 그대로 보여주고 Revalidator가 뒤에서 다시 받아
+캐시를 채웁니다. 또 자주 찾는 조회 조건 상위 N개는 soft TTL이 끝나기 lead초 전에
+미리 갱신해, 인기 있는 기간을 조회한 사용자가 만료 직후 전체 수집을 기다리지 않게 합니다.
+
+갱신은 작은 스레드 풀에서 실행하고, 같은 조건의 갱신이 이미 대기 중이면 다시 넣지 않습니다.
+실제 수집(및 캐시 저장)은 호출한 쪽이 넘긴 fetch(params, max_age)가 합니다.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Set
+
+from cache_store import ResultCache, normalize_params
+from instrument import redact_text
+
+logger = logging.getLogger(__name__)
+
+# 미리 갱신할 인기 조회 수, 만료 몇 초 전에 갱신할지, 인기 조회를 살펴보는 주기(초)
+DEFAULT_TOP_N = int(os.getenv("HRD_REFRESH_TOP_N", "5"))
+DEFAULT_LEAD = 300
+DEFAULT_INTERVAL = 60
+DEFAULT_WORKERS = 2
+
+# fetch(params, max_age): max_age초보다 오래된 데이터를 다시 받아 캐시에 저장
+RefreshFetch = Callable[[Dict[str, str], float], object]
+
+
+class Revalidator:
+    """캐시 항목을 백그라운드에서 다시 받아오는 작업자"""
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, top_n: int = DEFAULT_TOP_N,
+                 lead: float = DEFAULT_LEAD, interval: float = DEFAULT_INTERVAL):
+        self.top_n = top_n
+        self.lead = lead
+        self.interval = interval
+        self.refreshes = 0
+        self.failures = 0
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="revalidate")
+        self._pending: Set[str] = set()
+        self._lock = threading.Lock()
+        self._warmer: Optional[threading.Thread] = None
+
+    def refresh(self, cache: ResultCache, params: Dict[str, str], fetch: RefreshFetch) -> bool:
+        """params를 백그라운드에서 다시 받도록 예약합니다. 이미 예약되어 있으면 False를 반환합니다."""
+        key = normalize_params(params)
+        with self._lock:
+            if key in self._pending:
+                return False
+            self._pending.add(key)
+        # soft TTL이 끝나기 lead초 전부터 갱신하므로 그보다 오래된 날짜만 다시 받습니다.
+        self._pool.submit(self._refresh, key, params, fetch, max(0.0, cache.ttl - self.lead))
+        return True
+
+    def _refresh(self, key: str, params: Dict[str, str], fetch: RefreshFetch, max_age: float) -> None:
+        started = time.perf_counter()
+        try:
+            fetch(params, max_age)
+            with self._lock:
+                self.refreshes += 1
+            logger.info(f"백그라운드 갱신 완료: {key} ({time.perf_counter() - started:.1f}초)")
+        except Exception as e:
+            with self._lock:
+                self.failures += 1
+            logger.warning(f"백그라운드 갱신 실패: {key}: {redact_text(e)}")
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def warm_once(self, cache: ResultCache, fetch: RefreshFetch, extra: Optional[Dict[str, str]] = None) -> int:
+        """인기 조회 상위 top_n개 중 곧 만료될(또는 이미 오래된) 항목을 갱신 예약하고 그 수를 반환합니다.
+
+        캐시의 조회 조건에는 인증키가 없으므로 extra(예: {"authKey": ...})를 덧붙여 받습니다.
+        """
+        now = time.time()
+        scheduled = 0
+        for params, created_at in cache.hottest(self.top_n):
+            if now - created_at >= cache.ttl - self.lead:
+                scheduled += self.refresh(cache, {**params, **(extra or {})}, fetch)
+        return scheduled
+
+    def start(self, cache: ResultCache, fetch: RefreshFetch, extra: Optional[Dict[str, str]] = None) -> None:
+        """interval초마다 warm_once를 실행하는 데몬 스레드를 (프로세스에서 한 번만) 시작합니다."""
+        with self._lock:
+            if self._warmer is not None:
+                return
+            self._warmer = threading.Thread(
+                target=self._warm_forever, args=(cache, fetch, extra), name="revalidate-warmer", daemon=True,
+            )
+        self._warmer.start()
+
+    def _warm_forever(self, cache: ResultCache, fetch: RefreshFetch, extra: Optional[Dict[str, str]]) -> None:
+        while True:
+            try:
+                self.warm_once(cache, fetch, extra)
+            except Exception as e:
+                logger.warning(f"인기 조회 갱신 예약 실패: {redact_text(e)}")
+            time.sleep(self.interval)
+
+
+# 프로세스 안의 모든 세션이 공유하는 갱신 작업자 (singleflight.fetches와 같은 이유로 모듈에 둡니다)
+revalidator = Revalidator()
@@ -0,0 +1,107 @@
+"""훈련기관/훈련과정명 검색 색인과 강조 규칙
+
+훈련기관과 훈련과정명은 범주형 열이라 행 수가 많아도 고유값은 적습니다.
+SearchIndex는 고유값마다 정규화한 문자열(NFC, 대소문자 무시, 공백 제거)의
+글자 2-gram(한 글자 검색용 1-gram 포함) 역색인을 만들어 두고, 검색어의
+n-gram 교집합으로 후보를 좁힌 뒤 부분 문자열로 확인합니다. 맞은 범주 코드로
+행 마스크를 만들므로 검색 한 번의 비용은 고유값 후보 수와 코드 배열 비교뿐입니다.
+
+한글은 음절 단위로 n-gram을 만들므로 "알파코", "데이터 캠퍼스"처럼 띄어쓰기가
+달라도 찾을 수 있습니다.
+"""
+import os
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+SEARCH_COLUMNS = ["훈련기관", "훈련과정명"]
+# 강조할 기관 이름(부분 일치, 쉼표로 구분). 대시보드 사이드바에서 바꿀 수 있습니다.
+DEFAULT_HIGHLIGHT = os.getenv("HRD_HIGHLIGHT", "알파코")
+
+
+def normalize(text: str) -> str:
+    """검색용 정규화: NFC, 대소문자 무시, 공백 제거"""
+    return "".join(unicodedata.normalize("NFC", text).casefold().split())
+
+
+def ngrams(text: str) -> Set[str]:
+    """정규화한 문자열의 글자 1-gram과 2-gram"""
+    return set(text) | {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class _ColumnIndex:
+    """범주형 열 하나의 n-gram → 범주 코드 역색인"""
+
+    def __init__(self, categories: Iterable[str]):
+        self.values: List[str] = [normalize(str(value)) for value in categories]
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for code, value in enumerate(self.values):
+            for gram in ngrams(value):
+                postings[gram].append(code)
+        self.postings = {gram: np.array(codes, dtype=np.int32) for gram, codes in postings.items()}
+
+    def match(self, query: str) -> np.ndarray:
+        """정규화한 검색어를 부분 문자열로 포함하는 범주 코드"""
+        grams = {query} if len(query) < 2 else {query[i:i + 2] for i in range(len(query) - 1)}
+        if not grams or any(gram not in self.postings for gram in grams):
+            return np.empty(0, dtype=np.int32)
+        # 게시 목록이 짧은 n-gram부터 교집합을 구합니다.
+        ordered = sorted(grams, key=lambda gram: len(self.postings[gram]))
+        candidates = self.postings[ordered[0]]
+        for gram in ordered[1:]:
+            candidates = np.intersect1d(candidates, self.postings[gram], assume_unique=True)
+            if not len(candidates):
+                return candidates
+        # n-gram이 모두 있어도 순서가 다를 수 있으므로 부분 문자열로 확인합니다.
+        return np.array([code for code in candidates if query in self.values[code]], dtype=np.int32)
+
+
+class SearchIndex:
+    """데이터셋 하나의 검색 색인 (데이터를 불러올 때 한 번만 만듭니다)"""
+
+    def __init__(self, columns: Dict[str, _ColumnIndex]):
+        self.columns = columns
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns: Iterable[str] = SEARCH_COLUMNS) -> "SearchIndex":
+        return cls({name: _ColumnIndex(df[name].cat.categories) for name in columns if name in df.columns})
+
+    def row_mask(self, df: pd.DataFrame, text: str) -> np.ndarray:
+        """검색어가 어느 한 열에라도 들어 있는 행의 마스크. 공백으로 나눈 단어는 모두 포함해야 합니다."""
+        mask = np.ones(len(df), dtype=bool)
+        for word in text.split():
+            query = normalize(word)
+            word_mask = np.zeros(len(df), dtype=bool)
+            for name, index in self.columns.items():
+                codes = index.match(query)
+                if len(codes):
+                    # 범주 코드 → 일치 여부 조회표 (마지막 칸은 결측 코드 -1용)
+                    hits = np.zeros(len(index.values) + 1, dtype=bool)
+                    hits[codes] = True
+                    word_mask |= hits[df[name].cat.codes.to_numpy()]
+            mask &= word_mask
+        return mask
+
+
+class HighlightRules:
+    """강조할 기관 이름 규칙(정규화한 부분 일치). 호출하면 이름이 규칙에 맞는지 반환합니다."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: Tuple[str, ...] = tuple(sorted({normalize(p) for p in patterns if normalize(p)}))
+
+    @classmethod
+    def parse(cls, text: str) -> "HighlightRules":
+        """쉼표로 구분한 규칙 문자열을 읽습니다."""
+        return cls(text.split(","))
+
+    @property
+    def key(self) -> str:
+        """메모 키에 쓰는 규칙 식별자"""
+        return ",".join(self.patterns)
+
+    def __call__(self, name: str) -> bool:
+        value = normalize(name)
+        return any(pattern in value for pattern in self.patterns)
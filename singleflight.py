@@ -0,0 +1,90 @@
+"""같은 조회의 동시 요청 합치기(single-flight)
+
+여러 세션이 같은 조회 조건으로 동시에 캐시를 놓치면 각자 전체 페이지를 받아오는 대신,
+먼저 온 요청(리더) 하나만 실행하고 나머지(팔로워)는 그 결과나 오류를 함께 받습니다.
+키마다 따로 잠그므로 서로 다른 조회는 막지 않습니다. 한 서버 프로세스의 스레드 사이에서만
+합쳐지며, 프로세스 사이의 중복은 결과 캐시와 파티션 저장소가 줄입니다.
+
+리더가 보내는 진행 이벤트(notify)는 기록해 두었다가 늦게 합류한 팔로워에게도 처음부터
+다시 보내므로, 팔로워 화면도 리더와 같은 중간 결과를 그릴 수 있습니다.
+"""
+import threading
+from typing import Any, Callable, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+# notify(*event)로 보낸 이벤트를 받는 함수
+Listener = Callable[..., None]
+
+
+class _Call(Generic[T]):
+    """진행 중인 조회 하나 (리더 실행 결과와 이벤트 기록, 구독자)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.lock = threading.Lock()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+        self.history: List[Tuple[Any, ...]] = []
+        self.listeners: List[Listener] = []
+
+    def notify(self, *event: Any) -> None:
+        with self.lock:
+            self.history.append(event)
+            for listener in self.listeners:
+                listener(*event)
+
+    def subscribe(self, listener: Listener) -> None:
+        # 기록 재생과 구독 등록을 한 번에 해야 이벤트가 빠지거나 겹치지 않습니다.
+        with self.lock:
+            for event in self.history:
+                listener(*event)
+            self.listeners.append(listener)
+
+
+class SingleFlight(Generic[T]):
+    """키별 동시 실행 합치기. do()의 두 번째 반환값은 다른 요청의 결과를 받았는지 여부입니다."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call[T]] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.shared = 0
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def do(self, key: Hashable, run: Callable[[Listener], T],
+           listener: Optional[Listener] = None) -> Tuple[T, bool]:
+        """key로 진행 중인 실행이 있으면 기다려 결과를 받고, 없으면 run(notify)을 실행합니다."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.shared += 1
+        if listener:
+            call.subscribe(listener)
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = run(call.notify)
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # 끝난 키는 바로 지워, 이후 요청은 (캐시를 놓쳤다면) 새로 실행합니다.
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+# 프로세스 안의 모든 세션이 공유하는 조회 합치기. Streamlit은 재실행마다 앱 스크립트를
+# 새로 실행하므로, 세션 사이에 공유할 객체는 앱이 아니라 불러온 모듈에 둡니다.
+fetches: SingleFlight = SingleFlight()
@@ -0,0 +1,80 @@
+"""상세 데이터 표의 서버 쪽 필터/정렬/페이지 나누기
+
+전체 데이터프레임을 Styler로 문자열화해 브라우저에 보내는 대신, 필터와 정렬은
+행 위치(정수 배열)로만 계산하고 화면에는 현재 페이지 행만 잘라 보냅니다.
+위치 배열은 (필터, 정렬) 조건마다 한 번만 계산해 두면 되므로, 페이지를 넘길 때의
+비용은 전체 행 수와 무관하게 페이지 크기에만 비례합니다.
+
+범주형 열(훈련기관, 훈련과정명)은 고유값에서만 문자열 검색을 하고 코드로 거르며,
+범주가 사전순으로 정렬되어 있으므로(frame.py) 정렬도 코드 정렬로 충분합니다.
+"""
+import math
+from datetime import date
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+PAGE_SIZES = [50, 100, 500]
+SORT_COLUMNS = ["개강일", "훈련기관", "훈련과정명", "신청인원", "교육비", "교육비합계"]
+
+
+class TableQuery(NamedTuple):
+    """표 필터/정렬 조건 (메모 키로 쓰므로 해시 가능해야 합니다)"""
+
+    institute: str = ""
+    title: str = ""
+    start: Optional[date] = None
+    end: Optional[date] = None
+    sort_by: str = "개강일"
+    ascending: bool = True
+
+
+def _contains(column: pd.Series, text: str) -> np.ndarray:
+    """부분 문자열 검색 마스크. 범주형 열은 고유값에서만 검색합니다."""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        matched = column.cat.categories.str.contains(text, case=False, regex=False)
+        return np.asarray(matched, dtype=bool)[column.cat.codes.to_numpy()] & (column.cat.codes.to_numpy() >= 0)
+    return column.astype(str).str.contains(text, case=False, regex=False).to_numpy()
+
+
+def _sort_key(column: pd.Series) -> np.ndarray:
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.codes.to_numpy()
+    if column.dtype == object:
+        return column.astype(str).to_numpy()
+    return column.to_numpy()
+
+
+def select_rows(df: pd.DataFrame, query: TableQuery) -> np.ndarray:
+    """조건에 맞는 행 위치를 정렬 순서대로 반환합니다."""
+    mask = np.ones(len(df), dtype=bool)
+    if query.institute:
+        mask &= _contains(df["훈련기관"], query.institute)
+    if query.title:
+        mask &= _contains(df["훈련과정명"], query.title)
+    if query.start or query.end:
+        dates = df["개강일"].to_numpy()
+        if query.start:
+            mask &= dates >= np.datetime64(query.start)
+        if query.end:
+            mask &= dates < np.datetime64(query.end) + np.timedelta64(1, "D")
+    positions = np.flatnonzero(mask)
+    keys = _sort_key(df[query.sort_by].iloc[positions])
+    if query.ascending:
+        order = np.argsort(keys, kind="stable")
+    else:
+        # 뒤집은 배열을 안정 정렬한 뒤 다시 뒤집으면 같은 값끼리는 원래 순서가 유지됩니다.
+        order = (len(keys) - 1 - np.argsort(keys[::-1], kind="stable"))[::-1]
+    return positions[order]
+
+
+def page_count(total: int, page_size: int) -> int:
+    return max(1, math.ceil(total / page_size))
+
+
+def page_rows(df: pd.DataFrame, positions: np.ndarray, page: int, page_size: int) -> pd.DataFrame:
+    """page(1부터)번째 페이지의 행만 잘라 반환합니다."""
+    start = (page - 1) * page_size
+    return df.iloc[positions[start:start + page_size]]
+
@@ -0,0 +1,366 @@
+"""고용24 사업주훈련 API 수집 모듈
+
+app.py, app_v1.py, app_v2.py가 공통으로 사용하는 페이지 수집 엔진입니다.
+첫 페이지에서 전체 건수(scn_cnt)를 확인한 뒤 나머지 페이지를
+스레드 풀로 동시에 요청하고, 결과는 페이지 순서대로 다시 합칩니다.
+
+Work24Client는 연결 풀을 가진 requests.Session을 재사용하고(keep-alive),
+5xx/429/타임아웃/연결 오류는 지수 백오프(지터 포함)로 재시도합니다.
+재시도 후에도 실패한 페이지는 FetchResult.failed_pages로 알려 주므로,
+호출하는 쪽에서 일부만 수집된 결과를 구분할 수 있습니다.
+
+모든 요청은 프로세스 공유 토큰 버킷(ratelimit.shared_bucket)과 클라이언트별
+적응형 동시성 제한(ratelimit.AdaptiveConcurrency)을 거칩니다.
+
+긴 조회 기간은 fetch_range가 월 단위 구간으로 나눠 동시에 수집하고,
+(훈련과정ID, 회차) 기준으로 중복을 제거해 합칩니다.
+
+페이지별 시간과 행/바이트 수는 instrument.FetchStats에 모아 조회가 끝날 때
+요약 한 줄만 로그로 남깁니다(인증키는 로그에 남기지 않음).
+"""
+import logging
+import math
+import os
+import random
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from instrument import FetchStats, PageTimer, redact, redact_text, sampled
+from ratelimit import AdaptiveConcurrency, TokenBucket, shared_bucket
+from work24_parser import TrainingRecord, parse_page
+
+logger = logging.getLogger(__name__)
+
+# 벤치마크/개발 중에는 WORK24_BASE_URL로 로컬 대역 서버(bench/fake_work24.py)를 가리킬 수 있습니다.
+BASE_URL = os.getenv("WORK24_BASE_URL", "https://www.work24.go.kr/cm/openApi/call/hr/callOpenApiSvcInfo311L01.do")
+PAGE_SIZE = 100
+MAX_PAGES = 999  # 기존 range(1, 1000) 루프와 동일한 상한
+DEFAULT_CONCURRENCY = 8
+DEFAULT_TIMEOUT = 30
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5  # 초, 재시도마다 두 배
+DEFAULT_CHUNK_WORKERS = 4  # 동시에 수집할 월 구간 수
+MAX_RANGE_DAYS = 5 * 366  # 화면에서 한 번에 조회할 수 있는 최대 기간(약 5년)
+# 페이지 하나를 받을 때마다 그 페이지의 회차로 호출 (중간 결과 표시용)
+PageCallback = Callable[[List[TrainingRecord]], None]
+
+# 2025.5.21 변경사항 반영된 기본 요청 파라미터
+DEFAULT_PARAMS = {
+    "returnType": "XML",
+    "outType": "1",
+    "pageSize": str(PAGE_SIZE),
+    "crseTracseSe": "",
+    "sort": "ASC",
+    "sortCol": "TRNG_BGDE",
+}
+
+
+class FetchResult(list):
+    """수집한 TrainingRecord 목록. 재시도 후에도 실패한 페이지 번호를 함께 가집니다."""
+
+    def __init__(self, records: Iterable[TrainingRecord] = (), failed_pages: Iterable[int] = ()):
+        super().__init__(records)
+        self.failed_pages: List[int] = list(failed_pages)
+
+    @property
+    def complete(self) -> bool:
+        """모든 페이지를 받았으면 True"""
+        return not self.failed_pages
+
+
+class RetryableError(requests.RequestException):
+    """재시도할 수 있는 응답(5xx, 429)"""
+
+
+def build_request_params(params: Dict[str, str], page: int) -> Dict[str, str]:
+    """조회 조건에 페이지 번호를 더한 API 요청 파라미터를 만듭니다."""
+    request_params = {**DEFAULT_PARAMS, **params}
+    request_params["pageNum"] = str(page)
+    return request_params
+
+
+def page_count(total: int, page_size: int = PAGE_SIZE) -> int:
+    """전체 건수로부터 필요한 페이지 수를 계산합니다."""
+    return min(MAX_PAGES, math.ceil(total / page_size))
+
+
+def month_windows(start: date, end: date) -> List[Tuple[date, date]]:
+    """start~end(양끝 포함)를 달력 월 경계로 나눈 구간 목록을 반환합니다."""
+    windows = []
+    current = start
+    while current <= end:
+        next_month = (current.replace(day=1) + timedelta(days=32)).replace(day=1)
+        window_end = min(end, next_month - timedelta(days=1))
+        windows.append((current, window_end))
+        current = window_end + timedelta(days=1)
+    return windows
+
+
+def record_key(record: TrainingRecord) -> Hashable:
+    """중복 판단 키: (훈련유형, 훈련과정ID, 회차). 훈련과정ID가 없으면 행 전체를 씁니다."""
+    return (record.course_type, record.trpr_id, record.degree) if record.trpr_id else record
+
+
+def dedupe_records(records: Iterable[TrainingRecord]) -> List[TrainingRecord]:
+    """같은 훈련유형에서 (훈련과정ID, 회차)가 같은 행은 처음 나온 것만 남깁니다(순서 유지)."""
+    seen = set()
+    unique = []
+    for record in records:
+        key = record_key(record)
+        if key not in seen:
+            seen.add(key)
+            unique.append(record)
+    return unique
+
+
+def split_course_types(value: str) -> List[str]:
+    """crseTracseSe 값을 훈련유형 코드 목록으로 나눕니다.
+
+    쉼표로 여러 유형을 줄 수 있고(유형별로 따로 조회), 빈 값은 API의 전체 조회([""])입니다.
+    """
+    return [code.strip() for code in value.split(",") if code.strip()] or [""]
+
+
+def _parse_param_day(value: str) -> date:
+    return datetime.strptime(value, "%Y%m%d").date()
+
+
+class Work24Client:
+    """연결 풀과 재시도 정책을 가진 고용24 API 클라이언트"""
+
+    def __init__(self, base_url: str = BASE_URL, concurrency: int = DEFAULT_CONCURRENCY,
+                 timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF, bucket: Optional[TokenBucket] = None):
+        self.base_url = base_url
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        # 속도 제한은 프로세스 전체가, 동시성 한도는 클라이언트가 관리합니다.
+        self.bucket = bucket or shared_bucket()
+        self.limiter = AdaptiveConcurrency(self.concurrency)
+        self.server_throttle_events = 0
+        self._lock = threading.Lock()
+        self.session = requests.Session()
+        # 동시 요청 수만큼 연결을 유지해 페이지마다 TLS 핸드셰이크를 하지 않도록 합니다.
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "Work24Client":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def metrics(self) -> Dict[str, float]:
+        """현재 요청 속도, 진행 중 요청 수, 동시성 한도, 스로틀 횟수"""
+        return {
+            **self.bucket.metrics(),
+            **self.limiter.metrics(),
+            "server_throttle_events": self.server_throttle_events,
+        }
+
+    def _request_page(self, params: Dict[str, str], page: int,
+                      stats: Optional[FetchStats] = None) -> Tuple[Optional[int], List[TrainingRecord]]:
+        self.limiter.acquire()
+        try:
+            self.bucket.acquire()
+        except BaseException:
+            # 요청을 보내기 전에 실패했으므로(예: 공유 버킷 DB 잠김) 한도는 그대로 두고 자리만 돌려줍니다.
+            self.limiter.cancel()
+            raise
+        started = time.monotonic()
+        ok = False
+        try:
+            timer = PageTimer()
+            response = self.session.get(
+                self.base_url, params=build_request_params(params, page), timeout=self.timeout, stream=True
+            )
+            timer.lap("request")
+            with response:
+                if response.status_code == 429:
+                    with self._lock:
+                        self.server_throttle_events += 1
+                if response.status_code == 429 or response.status_code >= 500:
+                    raise RetryableError(f"HTTP {response.status_code}", response=response)
+                response.raise_for_status()
+                result = parse_page(
+                    timer.count_chunks(response.iter_content(chunk_size=64 * 1024)),
+                    params.get("crseTracseSe", ""),
+                )
+            timer.lap("parse")
+            ok = True
+            if stats is not None:
+                stats.add_page(timer, len(result[1]))
+            if sampled(logger):
+                logger.debug(
+                    f"페이지 {page} {redact(build_request_params(params, page))}: HTTP {response.status_code}, "
+                    f"{len(result[1])}행, {timer.bytes:,}B, "
+                    + ", ".join(f"{span} {seconds * 1000:.1f}ms" for span, seconds in timer.spans.items())
+                )
+            return result
+        finally:
+            self.limiter.release(time.monotonic() - started, ok)
+
+    def fetch_page(self, params: Dict[str, str], page: int,
+                   stats: Optional[FetchStats] = None) -> Tuple[Optional[int], List[TrainingRecord]]:
+        """한 페이지를 요청하고 스트리밍 파싱합니다. 일시적 오류는 재시도합니다.
+
+        재시도 후에도 실패하면 마지막 오류(requests.RequestException 또는
+        ET.ParseError)를 그대로 전달합니다. 4xx 응답은 재시도하지 않습니다.
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                return self._request_page(params, page, stats)
+            except (RetryableError, requests.Timeout, requests.ConnectionError, ET.ParseError) as e:
+                if attempt == self.retries:
+                    raise
+                if stats is not None:
+                    stats.count("retries")
+                # full jitter: 0 ~ backoff × 2^attempt 사이에서 무작위로 기다립니다.
+                delay = random.uniform(0, self.backoff * (2 ** attempt))
+                logger.warning(f"페이지 {page} 요청 실패({redact_text(e)}), {delay:.2f}초 후 재시도합니다.")
+                time.sleep(delay)
+        raise AssertionError("unreachable")
+
+    def _fetch_page_or_none(self, params: Dict[str, str], page: int,
+                            stats: Optional[FetchStats] = None) -> Optional[List[TrainingRecord]]:
+        try:
+            return self.fetch_page(params, page, stats)[1]
+        except (requests.RequestException, ET.ParseError) as e:
+            logger.error(f"페이지 {page}를 가져오지 못했습니다: {redact_text(e)}")
+            if stats is not None:
+                stats.count("failed_pages")
+            return None
+
+    def fetch_rows(self, params: Dict[str, str], stats: Optional[FetchStats] = None,
+                   on_page: Optional[PageCallback] = None) -> FetchResult:
+        """조회 조건에 해당하는 모든 훈련과정 회차를 페이지 순서대로 반환합니다.
+
+        첫 페이지를 받지 못하면 오류를 그대로 전달합니다. 이후 페이지가
+        재시도 후에도 실패하면 나머지 결과와 함께 failed_pages에 기록합니다.
+        stats를 주지 않으면 이 조회만의 계측 요약을 로그로 남기고,
+        주면 호출한 쪽이 여러 조회를 묶어 요약하도록 stats에 더하기만 합니다.
+        on_page는 페이지 순서대로, fetch_rows를 호출한 스레드에서 불립니다.
+        """
+        if stats is None:
+            stats = FetchStats(f"조회 {params.get('crseTracseSe') or '전체'} "
+                               f"{params.get('srchTraStDt')}~{params.get('srchTraEndDt')}")
+            try:
+                return self.fetch_rows(params, stats, on_page)
+            finally:
+                stats.log_summary(logger)
+
+        on_page = on_page or (lambda rows: None)
+        total, first_rows = self.fetch_page(params, 1, stats)
+        if not first_rows:
+            return FetchResult()
+        on_page(first_rows)
+
+        page_size = int(params.get("pageSize", PAGE_SIZE))
+        if total is None:
+            # 전체 건수를 알 수 없으면 기존처럼 빈 페이지가 나올 때까지 순차 조회
+            logger.warning("scn_cnt를 찾을 수 없어 순차 조회로 전환합니다.")
+            rows = FetchResult(first_rows)
+            for page in range(2, MAX_PAGES + 1):
+                page_rows = self._fetch_page_or_none(params, page, stats)
+                if page_rows is None:
+                    rows.failed_pages.append(page)
+                    break
+                if not page_rows:
+                    break
+                on_page(page_rows)
+                rows.extend(page_rows)
+            return rows
+
+        last_page = page_count(total, page_size)
+        logger.debug(f"전체 {total}건, {last_page}페이지를 최대 {self.concurrency}개씩 동시 요청합니다.")
+        result = FetchResult(first_rows)
+        if last_page > 1:
+            pages = range(2, last_page + 1)
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                # map은 제출 순서대로 결과를 돌려주므로 페이지 순서가 유지됩니다.
+                for page, page_rows in zip(pages, pool.map(
+                    lambda page: self._fetch_page_or_none(params, page, stats), pages
+                )):
+                    if page_rows is None:
+                        result.failed_pages.append(page)
+                    else:
+                        on_page(page_rows)
+                        result.extend(page_rows)
+        if not result.complete:
+            logger.warning(f"{len(result.failed_pages)}개 페이지를 가져오지 못해 일부 결과만 반환합니다.")
+        return result
+
+    def fetch_range(self, params: Dict[str, str],
+                    on_chunk: Optional[Callable[[date, date, FetchResult], None]] = None,
+                    chunk_workers: int = DEFAULT_CHUNK_WORKERS,
+                    stats: Optional[FetchStats] = None) -> FetchResult:
+        """조회 기간을 월 단위로 나눠 동시에 수집하고, 중복을 제거해 개강일 순서로 합칩니다.
+
+        on_chunk는 구간 하나가 끝날 때마다 호출하는 스레드에서 불립니다.
+        구간 하나라도 첫 페이지를 받지 못하면 오류를 그대로 전달합니다.
+        """
+        if stats is None:
+            stats = FetchStats(f"기간 조회 {params.get('crseTracseSe') or '전체'} "
+                               f"{params.get('srchTraStDt')}~{params.get('srchTraEndDt')}")
+            try:
+                return self.fetch_range(params, on_chunk, chunk_workers, stats)
+            finally:
+                stats.log_summary(logger)
+
+        windows = month_windows(_parse_param_day(params["srchTraStDt"]), _parse_param_day(params["srchTraEndDt"]))
+        chunks: Dict[int, FetchResult] = {}
+        with ThreadPoolExecutor(max_workers=max(1, chunk_workers)) as pool:
+            futures = {
+                pool.submit(self.fetch_rows, {
+                    **params,
+                    "srchTraStDt": window_start.strftime("%Y%m%d"),
+                    "srchTraEndDt": window_end.strftime("%Y%m%d"),
+                }, stats): index
+                for index, (window_start, window_end) in enumerate(windows)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                chunks[index] = future.result()
+                if on_chunk:
+                    on_chunk(*windows[index], chunks[index])
+        result = FetchResult(dedupe_records(row for index in sorted(chunks) for row in chunks[index]))
+        for index in sorted(chunks):
+            result.failed_pages.extend(chunks[index].failed_pages)
+        return result
+
+
+_default_client: Optional[Work24Client] = None
+_default_client_lock = threading.Lock()
+
+
+def default_client() -> Work24Client:
+    """프로세스에서 공유하는 기본 클라이언트를 반환합니다."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = Work24Client()
+        return _default_client
+
+
+def fetch_rows(params: Dict[str, str], client: Optional[Work24Client] = None,
+               stats: Optional[FetchStats] = None, on_page: Optional[PageCallback] = None) -> FetchResult:
+    """기본(또는 주어진) 클라이언트로 조회 조건의 모든 회차를 가져옵니다."""
+    return (client or default_client()).fetch_rows(params, stats, on_page)
+
+
+def fetch_range(params: Dict[str, str], client: Optional[Work24Client] = None) -> FetchResult:
+    """기본(또는 주어진) 클라이언트로 긴 조회 기간을 월 단위로 나눠 가져옵니다."""
+    return (client or default_client()).fetch_range(params)
@@ -0,0 +1,120 @@
+"""고용24 응답 XML 스트리밍 파서
+
+XMLPullParser로 응답을 청크 단위로 읽으면서 scn_list 한 행의 필드를
+한 번에 모아 TrainingRecord로 돌려주고, 처리한 행은 바로 비웁니다.
+전체 트리를 만든 뒤 행마다 findtext를 반복하던 방식보다 CPU를 약 1.3~1.5배 더 쓰고
+100행 페이지에서는 메모리 차이도 없습니다. 대신 페이지가 커져도 최대 메모리가 청크 하나와
+비운 행 요소 크기에 머뭅니다(10,000행 약 17.8MB → 5.9MB, bench/bench_parser.py).
+"""
+import logging
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+class TrainingRecord(NamedTuple):
+    """scn_list 한 행(훈련과정 회차)"""
+
+    institute: str      # subTitle (훈련기관)
+    title: str          # title (훈련과정명)
+    trpr_id: str        # trprId (훈련과정ID)
+    degree: str         # trprDegr (회차)
+    start_date: str     # traStartDate (개강일, YYYY-MM-DD)
+    applicants: int     # regCourseMan (신청인원)
+    fee: int            # realMan (교육비)
+    certificate: str    # certificate (자격증)
+    course_type: str = ""  # 조회한 crseTracseSe (훈련유형 코드, 응답에는 없음)
+
+    @property
+    def total_fee(self) -> int:
+        """교육비합계 (신청인원 × 교육비)"""
+        return self.applicants * self.fee
+
+
+# TrainingRecord 필드 순서대로 (XML 태그, 기본값, 정수 여부)
+FIELDS: List[Tuple[str, str, bool]] = [
+    ("subTitle", "", False),
+    ("title", "", False),
+    ("trprId", "", False),
+    ("trprDegr", "", False),
+    ("traStartDate", "", False),
+    ("regCourseMan", "0", True),
+    ("realMan", "0", True),
+    ("certificate", "", False),
+]
+
+# 훈련유형 코드(crseTracseSe) → 화면 표시 이름
+COURSE_TYPES: Dict[str, str] = {
+    "C0041T": "일반직무훈련",
+    "C0041B": "기업직업훈련카드",
+    "C0041N": "고숙련신기술훈련",
+    "C0041A": "HRD 아카이브",
+    "C0041H": "패키지구독형 원격",
+}
+
+
+class PageMeta:
+    """파싱 중 함께 읽은 페이지 정보 (전체 건수, srchList 존재 여부)"""
+
+    def __init__(self):
+        self.total: Optional[int] = None
+        self.has_list = False
+
+
+def _to_record(row: ET.Element, course_type: str = "") -> TrainingRecord:
+    # 필드마다 findtext로 자식을 다시 훑지 않고, 자식을 한 번만 돌며 태그 → 텍스트를 모읍니다.
+    values = {child.tag: child.text or "" for child in row}
+    return TrainingRecord(*[
+        int(values.get(tag, default)) if numeric else values.get(tag, default).strip()
+        for tag, default, numeric in FIELDS
+    ], course_type)
+
+
+def iter_records(chunks: Iterable[bytes], meta: Optional[PageMeta] = None,
+                 course_type: str = "") -> Iterator[TrainingRecord]:
+    """응답 바이트 청크를 받아 TrainingRecord를 하나씩 반환합니다.
+
+    응답에는 훈련유형이 없으므로 조회한 훈련유형 코드(course_type)를 행마다 붙입니다.
+
+    숫자 필드를 변환할 수 없는 행은 경고만 남기고 건너뜁니다.
+    XML 자체가 깨진 경우 ET.ParseError가 발생합니다.
+    """
+    meta = meta if meta is not None else PageMeta()
+    # start 이벤트까지 받으면 태그마다 파이썬 코드가 한 번 더 돌므로 end 이벤트만 받습니다.
+    parser = ET.XMLPullParser(events=("end",))
+
+    def drain() -> Iterator[TrainingRecord]:
+        for _, elem in parser.read_events():
+            tag = elem.tag
+            if tag == "scn_list":
+                try:
+                    yield _to_record(elem, course_type)
+                except (ValueError, TypeError) as e:
+                    logger.warning(f"데이터 변환 중 오류 발생: {e}")
+                # 처리한 행은 비워 메모리를 바로 돌려줍니다(빈 요소만 srchList에 남습니다).
+                elem.clear()
+            elif tag == "srchList":
+                meta.has_list = True
+                elem.clear()
+            elif tag == "scn_cnt":
+                text = (elem.text or "").strip()
+                if text.isdigit():
+                    meta.total = int(text)
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
+
+
+def parse_page(content: Union[bytes, Iterable[bytes]],
+               course_type: str = "") -> Tuple[Optional[int], List[TrainingRecord]]:
+    """한 페이지 응답에서 전체 건수와 레코드 목록을 꺼냅니다."""
+    chunks = [content] if isinstance(content, bytes) else content
+    meta = PageMeta()
+    records = list(iter_records(chunks, meta, course_type))
+    if not meta.has_list:
+        logger.warning("srchList를 찾을 수 없습니다.")
+    return meta.total, records